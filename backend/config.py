@@ -1,90 +1,234 @@
 """
 Configuration file for Chatbox App
 All constants and configurable parameters are defined here
+
+Values are read from the environment once, on first access, and cached in a
+frozen Config instance (see get_config()). The module-level constants
+(CHUNK_SIZE, POSTGRES_DB, ...) are resolved lazily through __getattr__, so
+`from config import CHUNK_SIZE` keeps working unchanged.
 """
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# ============================================
-# RAG System Configuration
-# ============================================
-
-# Chunking Strategy
-CHUNK_SIZE = int(os.getenv("RAG_CHUNK_SIZE", "500"))  # Characters per chunk
-CHUNK_OVERLAP = int(os.getenv("RAG_CHUNK_OVERLAP", "50"))  # Overlap between chunks
-CHUNK_MIN_SIZE = int(os.getenv("RAG_CHUNK_MIN_SIZE", "100"))  # Minimum chunk size
-EMBEDDING_MAX_LENGTH = int(os.getenv("EMBEDDING_MAX_LENGTH", "8000"))  # Max characters for embedding model
-
-# Embedding Configuration
-EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
-EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "1536"))  # Dimension for ada-002
-
-# Retrieval Configuration
-RAG_TOP_K = int(os.getenv("RAG_TOP_K", "3"))  # Number of chunks to retrieve
-RAG_SIMILARITY_THRESHOLD = float(os.getenv("RAG_SIMILARITY_THRESHOLD", "0.0"))  # Minimum similarity score
-
-# Milvus Lite Configuration (local/embedded version)
-MILVUS_LITE_PATH = os.getenv("MILVUS_LITE_PATH", "./milvus_lite.db")  # Local file path for Milvus Lite
-MILVUS_COLLECTION = os.getenv("MILVUS_COLLECTION", "chatbox_vectors")
-MILVUS_METRIC_TYPE = os.getenv("MILVUS_METRIC_TYPE", "L2")  # Distance metric: L2, IP, COSINE
-
-# ============================================
-# LLM Configuration
-# ============================================
-
-# Chat Completion Parameters
-LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.7"))
-LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "500"))
-LLM_TOP_P = float(os.getenv("LLM_TOP_P", "1.0"))
-LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60.0"))  # Timeout in seconds for API calls
-
-# ============================================
-# File Upload Configuration
-# ============================================
-
-MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024)))  # 10MB default
-
-# ============================================
-# Database Configuration
-# ============================================
-
-# PostgreSQL
-POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
-POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
-
-# ============================================
-# Session Configuration
-# ============================================
-
-SESSIONS_DIR = os.getenv("SESSIONS_DIR", "./sessions")
-
-# ============================================
-# Database Configuration (PostgreSQL)
-# ============================================
-
-POSTGRES_DB = os.getenv("POSTGRES_DB", "chatbox_rag")
-POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
-POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
-
-# ============================================
-# Backup Configuration
-# ============================================
-
-BACKUP_DIR = os.getenv("BACKUP_DIR", "./backups")
-BACKUP_ON_SHUTDOWN = os.getenv("BACKUP_ON_SHUTDOWN", "true").lower() == "true"
-RESTORE_ON_START = os.getenv("RESTORE_ON_START", "false").lower() == "true"
-
-# ============================================
-# Server Configuration
-# ============================================
-
-SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
-SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
-
-# ============================================
-# Feature Flags
-# ============================================
-
-RAG_ENABLED = os.getenv("RAG_ENABLED", "true").lower() == "true"
+import re
+import sys
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Dict, Mapping
+
+# .env lives next to this file (backend/.env)
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+
+# Accepted spellings for boolean flags, compared case-insensitively (anything else is False)
+_TRUTHY = frozenset({"1", "true", "yes", "y", "on"})
+
+# Quoted .env value at the start of the value: "double" or 'single'
+_ENV_QUOTED_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|\'((?:[^\'\\]|\\.)*)\'')
+# Backslash escapes understood inside double-quoted .env values
+_ENV_ESCAPE_RE = re.compile(r'\\([\\"\'nrt])')
+_ENV_ESCAPES = {"n": "\n", "r": "\r", "t": "\t"}
+# Single-quoted values only unescape \' and \\
+_ENV_SINGLE_ESCAPE_RE = re.compile(r"\\([\\'])")
+
+
+@dataclass(frozen=True)
+class Config:
+    """Immutable snapshot of all configuration values"""
+
+    # ============================================
+    # RAG System Configuration
+    # ============================================
+
+    # Chunking Strategy
+    CHUNK_SIZE: int  # Characters per chunk
+    CHUNK_OVERLAP: int  # Overlap between chunks
+    CHUNK_MIN_SIZE: int  # Minimum chunk size
+    EMBEDDING_MAX_LENGTH: int  # Max characters for embedding model
+
+    # Embedding Configuration
+    EMBEDDING_MODEL: str
+    EMBEDDING_DIM: int  # Dimension for ada-002
+
+    # Retrieval Configuration
+    RAG_TOP_K: int  # Number of chunks to retrieve
+    RAG_SIMILARITY_THRESHOLD: float  # Minimum similarity score
+
+    # Milvus Lite Configuration (local/embedded version)
+    MILVUS_LITE_PATH: str  # Local file path for Milvus Lite
+    MILVUS_COLLECTION: str
+    MILVUS_METRIC_TYPE: str  # Distance metric: L2, IP, COSINE
+    MILVUS_INSERT_BATCH_SIZE: int  # Vectors per Milvus insert call
+
+    # ============================================
+    # LLM Configuration
+    # ============================================
+
+    # Chat Completion Parameters
+    LLM_TEMPERATURE: float
+    LLM_MAX_TOKENS: int
+    LLM_TIMEOUT: float  # Timeout in seconds for API calls
+
+    # ============================================
+    # File Upload Configuration
+    # ============================================
+
+    MAX_FILE_SIZE: int  # 10MB default
+
+    # ============================================
+    # Database Configuration (PostgreSQL)
+    # ============================================
+
+    POSTGRES_HOST: str
+    POSTGRES_PORT: str
+    POSTGRES_DB: str
+    POSTGRES_USER: str
+    POSTGRES_PASSWORD: str
+
+    # Connection pool (pre-ping defaults to off behind PgBouncer, see from_env)
+    DB_POOL_SIZE: int
+    DB_MAX_OVERFLOW: int
+    DB_POOL_RECYCLE: int  # Seconds before a pooled connection is replaced
+    DB_POOL_PRE_PING: bool
+
+    # ============================================
+    # Session Configuration
+    # ============================================
+
+    SESSIONS_DIR: str
+
+    # ============================================
+    # Backup Configuration
+    # ============================================
+
+    BACKUP_DIR: str
+    BACKUP_ON_SHUTDOWN: bool
+    RESTORE_ON_START: bool
+
+    # ============================================
+    # Server Configuration
+    # ============================================
+
+    SERVER_PORT: int
+    SERVER_HOST: str
+
+    # ============================================
+    # Feature Flags
+    # ============================================
+
+    RAG_ENABLED: bool
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str]) -> 'Config':
+        """
+        Coerce raw environment strings into typed values (done once per snapshot)
+        Strings compared against literals on the retrieval path are interned
+        """
+        return cls(
+            CHUNK_SIZE=int(env.get("RAG_CHUNK_SIZE", "500")),
+            CHUNK_OVERLAP=int(env.get("RAG_CHUNK_OVERLAP", "50")),
+            CHUNK_MIN_SIZE=int(env.get("RAG_CHUNK_MIN_SIZE", "100")),
+            EMBEDDING_MAX_LENGTH=int(env.get("EMBEDDING_MAX_LENGTH", "8000")),
+            EMBEDDING_MODEL=sys.intern(env.get("EMBEDDING_MODEL", "text-embedding-ada-002")),
+            EMBEDDING_DIM=int(env.get("EMBEDDING_DIM", "1536")),
+            RAG_TOP_K=int(env.get("RAG_TOP_K", "3")),
+            RAG_SIMILARITY_THRESHOLD=float(env.get("RAG_SIMILARITY_THRESHOLD", "0.0")),
+            MILVUS_LITE_PATH=sys.intern(env.get("MILVUS_LITE_PATH", "./milvus_lite.db")),
+            MILVUS_COLLECTION=sys.intern(env.get("MILVUS_COLLECTION", "chatbox_vectors")),
+            MILVUS_METRIC_TYPE=sys.intern(env.get("MILVUS_METRIC_TYPE", "L2")),
+            MILVUS_INSERT_BATCH_SIZE=int(env.get("MILVUS_INSERT_BATCH_SIZE", "1000")),
+            LLM_TEMPERATURE=float(env.get("LLM_TEMPERATURE", "0.7")),
+            LLM_MAX_TOKENS=int(env.get("LLM_MAX_TOKENS", "500")),
+            LLM_TIMEOUT=float(env.get("LLM_TIMEOUT", "60.0")),
+            MAX_FILE_SIZE=int(env.get("MAX_FILE_SIZE", str(10 * 1024 * 1024))),
+            POSTGRES_HOST=env.get("POSTGRES_HOST", "localhost"),
+            POSTGRES_PORT=env.get("POSTGRES_PORT", "5432"),
+            POSTGRES_DB=env.get("POSTGRES_DB", "chatbox_rag"),
+            POSTGRES_USER=env.get("POSTGRES_USER", "postgres"),
+            POSTGRES_PASSWORD=env.get("POSTGRES_PASSWORD", "postgres"),
+            DB_POOL_SIZE=int(env.get("DB_POOL_SIZE", "20")),
+            DB_MAX_OVERFLOW=int(env.get("DB_MAX_OVERFLOW", "10")),
+            DB_POOL_RECYCLE=int(env.get("DB_POOL_RECYCLE", "60")),
+            # A SELECT 1 per checkout is wasted (and leaves server connections
+            # idle in transaction) with PgBouncer in transaction pooling mode
+            DB_POOL_PRE_PING=env.get(
+                "DB_POOL_PRE_PING", "false" if env.get("PGBOUNCER", "false").lower() in _TRUTHY else "true"
+            ).lower() in _TRUTHY,
+            SESSIONS_DIR=env.get("SESSIONS_DIR", "./sessions"),
+            BACKUP_DIR=env.get("BACKUP_DIR", "./backups"),
+            BACKUP_ON_SHUTDOWN=env.get("BACKUP_ON_SHUTDOWN", "true").lower() in _TRUTHY,
+            RESTORE_ON_START=env.get("RESTORE_ON_START", "false").lower() in _TRUTHY,
+            SERVER_PORT=int(env.get("SERVER_PORT", "8000")),
+            SERVER_HOST=env.get("SERVER_HOST", "0.0.0.0"),
+            RAG_ENABLED=env.get("RAG_ENABLED", "true").lower() in _TRUTHY,
+        )
+
+
+def _parse_env_file(path: str) -> Dict[str, str]:
+    """Parse KEY=VALUE lines from a .env file (comments, quotes and `export ` are handled)"""
+    parsed = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("export "):
+                line = line[7:].lstrip()
+            key, sep, value = line.partition("=")
+            key = key.strip()
+            if not sep or not key:
+                continue
+            value = value.strip()
+            quoted = _ENV_QUOTED_RE.match(value)
+            if quoted:
+                # Anything after the closing quote (e.g. `# note`) is dropped
+                if quoted.group(1) is not None:
+                    value = _ENV_ESCAPE_RE.sub(
+                        lambda m: _ENV_ESCAPES.get(m.group(1), m.group(1)), quoted.group(1)
+                    )
+                else:
+                    value = _ENV_SINGLE_ESCAPE_RE.sub(r"\1", quoted.group(2))
+            else:
+                # Unquoted values may carry an inline comment: KEY=value  # note
+                comment = value.find(" #")
+                if comment != -1:
+                    value = value[:comment].rstrip()
+            parsed[key] = value
+    return parsed
+
+
+def load_env_file(path: str = ENV_FILE) -> Dict[str, str]:
+    """
+    Load a .env file into os.environ without overriding variables already set
+    Returns the parsed values (empty if the file does not exist)
+    """
+    if not os.path.isfile(path):
+        return {}
+    parsed = _parse_env_file(path)
+    for key, value in parsed.items():
+        os.environ.setdefault(key, value)
+    return parsed
+
+
+if not os.getenv("CONFIG_SKIP_DOTENV"):
+    load_env_file()
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """
+    Build the configuration once from a single environment snapshot
+    The result is cached per process; forked workers inherit it unchanged
+    """
+    return Config.from_env(dict(os.environ))
+
+
+_CONFIG_NAMES = frozenset(f.name for f in fields(Config))
+
+
+def __getattr__(name: str):
+    """Resolve module-level constants (PEP 562) from the cached Config"""
+    if name in _CONFIG_NAMES:
+        return getattr(get_config(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_CONFIG_NAMES))
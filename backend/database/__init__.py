@@ -1,37 +1,44 @@
 """
 Database package for RAG System
 Contains database management, models, and verification tools
-"""
-from .database_manager import DatabaseManager, Document, Chunk, Base
-from .models import (
-    DocumentData,
-    ChunkData,
-    VectorData,
-    SearchResult,
-    VerificationResult,
-    ResyncResult,
-    DocumentListItem,
-    TOCItem
-)
 
-from .backup_manager import BackupManager
+Exports are resolved lazily (PEP 562) so that importing a lightweight data
+class such as DocumentData does not pull in SQLAlchemy/pymilvus.
+"""
+import importlib
 
-__all__ = [
+# Exported name -> submodule that defines it
+_LAZY = {
     # ORM Models (for database operations)
-    'DatabaseManager',
-    'Document',
-    'Chunk',
-    'Base',
+    'DatabaseManager': '.database_manager',
+    'Document': '.database_manager',
+    'Chunk': '.database_manager',
+    'Base': '.database_manager',
     # Data Classes (for business logic)
-    'DocumentData',
-    'ChunkData',
-    'VectorData',
-    'SearchResult',
-    'VerificationResult',
-    'ResyncResult',
-    'DocumentListItem',
-    'TOCItem',
+    'DocumentData': '.models',
+    'ChunkData': '.models',
+    'VectorData': '.models',
+    'SearchResult': '.models',
+    'VerificationResult': '.models',
+    'ResyncResult': '.models',
+    'DocumentListItem': '.models',
+    'TOCItem': '.models',
     # Backup Manager
-    'BackupManager'
-]
+    'BackupManager': '.backup_manager',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    """Import the defining submodule on first access and cache the export"""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
+def __dir__():
+    return __all__
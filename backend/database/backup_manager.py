@@ -2,12 +2,22 @@
 Database Backup and Restore Manager
 Handles automatic backup and restore of PostgreSQL and Milvus Lite databases
 """
+import hashlib
 import os
+import re
+import shlex
 import shutil
+import signal
 import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Iterator, List, Set
 import json
 
 from config import (
@@ -15,6 +25,42 @@ from config import (
     MILVUS_LITE_PATH
 )
 
+# Timestamp embedded at the end of backup file names: *_YYYYMMDD_HHMMSS.sql / .db
+BACKUP_TIMESTAMP_RE = re.compile(r'(\d{8}_\d{6})\.(?:sql|db)$')
+
+# Read size when streaming pg_dump output to disk
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Frame header of zstd-compressed data (backups piped through the zstd CLI)
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# zstd compressor used for pg_dump output when the CLI is installed
+ZSTD_COMPRESS_ARGS = ('-T0', '-q', '-c')
+
+# Variables forwarded to pg_dump/psql/docker subprocesses
+# (SYSTEMROOT/COMSPEC/PATHEXT/TEMP/TMP are required for child processes on Windows)
+SUBPROCESS_ENV_PASSTHROUGH = (
+    "PATH", "HOME", "LANG", "LC_ALL", "DOCKER_HOST", "DOCKER_CONFIG",
+    "SYSTEMROOT", "COMSPEC", "PATHEXT", "TEMP", "TMP"
+)
+
+# Backup file extension per backup type (subdirectory)
+BACKUP_SUFFIXES = {"postgres": ".sql", "milvus": ".db"}
+
+# Per-type file recording the name of the backup currently kept
+CURRENT_BACKUP_MARKER = ".current"
+
+# Seconds a docker container availability probe stays valid
+DOCKER_CHECK_TTL = 5.0
+
+# Linux FICLONE ioctl: O(1) copy-on-write clone on btrfs/XFS/overlayfs
+if sys.platform.startswith('linux'):
+    import fcntl
+    FICLONE = 0x40049409
+else:
+    fcntl = None
+    FICLONE = None
+
 
 class BackupManager:
     """
@@ -22,6 +68,9 @@ class BackupManager:
     Uses Docker exec for PostgreSQL backups when container is available
     """
     
+    # Backup directories already created in this process (skips repeat mkdirs)
+    _initialized_dirs: Set[Path] = set()
+    
     def __init__(self, backup_dir: str = "./backups", postgres_container: str = "chatbox-postgres"):
         """
         Initialize BackupManager
@@ -31,70 +80,375 @@ class BackupManager:
             postgres_container: Docker container name for PostgreSQL (default: chatbox-postgres)
         """
         self.backup_dir = Path(backup_dir)
-        self.backup_dir.mkdir(parents=True, exist_ok=True)
         self.postgres_container = postgres_container
+        # Resolve the docker CLI once instead of searching PATH on every call
+        self._docker_bin = shutil.which('docker')
+        # Optional: when present, dumps are compressed with multithreaded zstd
+        # instead of pg_dump's built-in single-threaded zlib
+        self._zstd_bin = shutil.which('zstd')
+        # (monotonic timestamp, result) of the last docker container probe
+        self._docker_cache: Optional[Tuple[float, bool]] = None
+        # Minimal child environment shared by every pg_dump/psql/docker call
+        # (built once instead of copying os.environ per subprocess)
+        self._pg_env = {
+            name: os.environ[name] for name in SUBPROCESS_ENV_PASSTHROUGH if name in os.environ
+        }
+        self._pg_env.setdefault('PATH', os.defpath)
+        self._pg_env.setdefault('LANG', 'C.UTF-8')
+        # Backup subdirectories and the Milvus Lite file, resolved once
+        self._pg_dir = self.backup_dir / "postgres"
+        self._mv_dir = self.backup_dir / "milvus"
+        self._meta_dir = self.backup_dir / "metadata"
+        self._type_dirs = {"postgres": self._pg_dir, "milvus": self._mv_dir}
+        self._milvus_path = Path(MILVUS_LITE_PATH)
+        if not self._milvus_path.is_absolute():
+            # Relative paths are relative to the backend directory
+            self._milvus_path = Path(__file__).resolve().parent.parent / MILVUS_LITE_PATH
+        
+        # Ensure backup directories exist (once per directory per process)
+        if self.backup_dir not in BackupManager._initialized_dirs:
+            for subdir in (self._pg_dir, self._mv_dir, self._meta_dir):
+                subdir.mkdir(parents=True, exist_ok=True)
+            BackupManager._initialized_dirs.add(self.backup_dir)
+        
+        self._build_commands()
+    
+    def _build_commands(self) -> None:
+        """
+        Precompute the docker/psql/pg_dump/pg_restore command lines
+        Everything in them is fixed per instance, so they are built once here
+        """
+        docker = self._docker_bin or 'docker'
+        docker_exec = [docker, 'exec', self.postgres_container]
+        docker_exec_stdin = [docker, 'exec', '-i', self.postgres_container]
+        # Connection options: inside the container the default socket is used
+        docker_conn = ['-U', POSTGRES_USER]
+        local_conn = ['-h', POSTGRES_HOST, '-p', str(POSTGRES_PORT), '-U', POSTGRES_USER]
+        
+        self._docker_ps_cmd = [
+            docker, 'ps', '--filter', f'name={self.postgres_container}', '--format', '{{.Names}}'
+        ]
+        
+        dump_args = ['-d', POSTGRES_DB, '-F', 'c']  # Custom format (compressed)
+        if self._zstd_bin:
+            # Leave compression to zstd (multithreaded, faster and smaller
+            # than pg_dump's zlib); the file name stays *.sql and restore
+            # recognises the zstd frame header
+            dump_args += ['-Z', '0']
+        self._zstd_compress_cmd = [self._zstd_bin, *ZSTD_COMPRESS_ARGS] if self._zstd_bin else None
+        self._pg_dump_docker = docker_exec + ['pg_dump'] + docker_conn + dump_args
+        self._pg_dump_local = ['pg_dump'] + local_conn + dump_args
+        
+        # Separate -c flags are required because DROP DATABASE can't run
+        # inside a transaction block
+        recreate_args = [
+            '-d', 'postgres',
+            '-v', 'ON_ERROR_STOP=1',
+            '-c', f'DROP DATABASE IF EXISTS {POSTGRES_DB};',
+            '-c', f'CREATE DATABASE {POSTGRES_DB};'
+        ]
+        self._psql_recreate_local = ['psql'] + local_conn + recreate_args
+        
+        # pg_restore reads the backup from stdin
+        restore_args = [
+            '-d', POSTGRES_DB,
+            '-c',  # Clean (drop) existing objects
+            '--if-exists'  # ...without failing on a freshly created database
+        ]
+        self._pg_restore_docker = docker_exec_stdin + ['pg_restore'] + docker_conn + restore_args
+        self._pg_restore_local = ['pg_restore'] + local_conn + restore_args
+        
+        # Docker drop/recreate + restore in one exec: the container's shell
+        # sequences both steps while the backup streams in over stdin
+        recreate_and_restore = ' '.join(
+            shlex.quote(arg) for arg in ['psql', '-q'] + docker_conn + recreate_args
+        ) + ' && exec ' + ' '.join(
+            shlex.quote(arg) for arg in ['pg_restore'] + docker_conn + restore_args
+        )
+        self._pg_recreate_restore_docker = docker_exec_stdin + ['sh', '-c', recreate_and_restore]
+    
+    @contextmanager
+    def _pgpass_env(self) -> Iterator[Dict[str, str]]:
+        """
+        Child environment pointing PGPASSFILE at a temporary libpq password file
+        The password goes through a private (mode 0600) mkstemp file rather than
+        the environment, where it would show up in /proc/<pid>/environ; the file
+        only exists for the duration of the pg_dump/psql/pg_restore call
         
-        # Ensure backup directory exists
-        (self.backup_dir / "postgres").mkdir(exist_ok=True)
-        (self.backup_dir / "milvus").mkdir(exist_ok=True)
-        (self.backup_dir / "metadata").mkdir(exist_ok=True)
+        Yields:
+            Environment dict for the subprocess
+        """
+        def escape(value: str) -> str:
+            return str(value).replace('\\', '\\\\').replace(':', '\\:')
+        
+        line = ':'.join(escape(field) for field in (
+            '*', '*', '*', POSTGRES_USER, POSTGRES_PASSWORD
+        ))
+        fd, pgpass = tempfile.mkstemp(prefix='pgpass_')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(line + '\n')
+            yield {**self._pg_env, 'PGPASSFILE': pgpass}
+        finally:
+            os.unlink(pgpass)
     
     def _check_docker_container(self) -> bool:
         """
         Check if PostgreSQL Docker container exists and is running
+        The result is cached for DOCKER_CHECK_TTL seconds so back-to-back
+        backup/restore calls (e.g. from backup_all) only probe docker once
         
         Returns:
             True if container exists and is running, False otherwise
         """
+        if self._docker_bin is None:
+            return False  # Docker CLI not installed
+        
+        now = time.monotonic()
+        if self._docker_cache is not None and now - self._docker_cache[0] < DOCKER_CHECK_TTL:
+            return self._docker_cache[1]
+        
         try:
             result = subprocess.run(
-                ['docker', 'ps', '--filter', f'name={self.postgres_container}', '--format', '{{.Names}}'],
+                self._docker_ps_cmd,
                 capture_output=True,
                 text=True,
                 timeout=5
             )
-            return result.returncode == 0 and self.postgres_container in result.stdout
+            available = result.returncode == 0 and self.postgres_container in result.stdout
         except (FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+            available = False
+        
+        self._docker_cache = (now, available)
+        return available
+    
+    @staticmethod
+    def _copy_file(src: Path, dst: Path) -> None:
+        """
+        Copy file contents from src to dst
+        Tries a reflink (FICLONE) first, then shutil.copyfile, which uses
+        in-kernel sendfile/copy_file_range on Linux
+        """
+        if FICLONE is not None:
+            try:
+                with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return
+            except OSError:
+                pass  # Filesystem doesn't support reflinks
+        shutil.copyfile(src, dst)
     
-    def _cleanup_old_backups(self, backup_type: str) -> None:
+    @staticmethod
+    def _stream_to_file(cmd: List[str], env: Dict[str, str], dest: Path, timeout: float,
+                        filter_cmd: Optional[List[str]] = None) -> Tuple[int, str, str]:
         """
-        Delete old backups, keeping only the latest one
+        Run a command, streaming its stdout into dest while hashing it (BLAKE2b)
         
         Args:
-            backup_type: 'postgres' or 'milvus'
+            cmd: Command to run
+            env: Environment for the child process
+            dest: File to write stdout to
+            timeout: Seconds before the process is killed
+            filter_cmd: Optional command the output is piped through first (e.g. zstd)
+            
+        Returns:
+            Tuple of (returncode, stderr text, hex digest of the written data)
+            The returncode is the first non-zero one of the pipeline, if any
+            
+        Raises:
+            subprocess.TimeoutExpired: If the command exceeded the timeout
         """
-        backup_type_dir = self.backup_dir / backup_type
-        if not backup_type_dir.exists():
-            return
+        digest = hashlib.blake2b()
+        timed_out = threading.Event()
+        procs = []
         
-        # Get all backup files
-        if backup_type == 'postgres':
-            backup_files = list(backup_type_dir.glob("*.sql"))
-        else:  # milvus
-            backup_files = list(backup_type_dir.glob("*.db"))
-        
-        if len(backup_files) <= 1:
-            return  # Keep the only backup or no backups
+        # stderr goes to a temp file so a chatty child can't block on a full pipe
+        with tempfile.TemporaryFile() as stderr_file:
+            try:
+                procs.append(subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=stderr_file))
+                if filter_cmd:
+                    procs.append(subprocess.Popen(
+                        filter_cmd, env=env, stdin=procs[0].stdout,
+                        stdout=subprocess.PIPE, stderr=stderr_file
+                    ))
+                    # Only the filter may hold the read end, so it sees EOF/SIGPIPE
+                    procs[0].stdout.close()
+                
+                def kill_on_timeout():
+                    timed_out.set()
+                    for proc in procs:
+                        proc.kill()
+                
+                timer = threading.Timer(timeout, kill_on_timeout)
+                timer.start()
+                try:
+                    output = procs[-1].stdout
+                    with open(dest, 'wb') as out:
+                        while True:
+                            chunk = output.read(STREAM_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            digest.update(chunk)
+                            out.write(chunk)
+                    for proc in procs:
+                        proc.wait()
+                finally:
+                    timer.cancel()
+            finally:
+                for proc in procs:
+                    if proc.poll() is None:
+                        proc.kill()
+                        proc.wait()
+                    if proc.stdout and not proc.stdout.closed:
+                        proc.stdout.close()
+            
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors='replace')
         
-        # Sort by modification time (newest first)
-        backup_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+        returncode = next((proc.returncode for proc in procs if proc.returncode), 0)
+        return returncode, stderr, digest.hexdigest()
+    
+    def _run_with_backup_stdin(self, cmd: List[str], env: Dict[str, str], backup_path: Path,
+                               timeout: float) -> Tuple[int, str]:
+        """
+        Run a command with a backup file on stdin, decompressing zstd backups on the fly
         
-        # Delete all except the latest
-        for old_backup in backup_files[1:]:
+        Args:
+            cmd: Command to run (e.g. pg_restore reading from stdin)
+            env: Environment for the child process
+            backup_path: Backup file to feed in
+            timeout: Seconds before the process is killed
+            
+        Returns:
+            Tuple of (returncode, stderr or stdout text)
+            
+        Raises:
+            subprocess.TimeoutExpired: If the command exceeded the timeout
+        """
+        # Unbuffered, so seek(0) really rewinds the descriptor handed to the child
+        with open(backup_path, 'rb', buffering=0) as backup_file:
+            compressed = backup_file.read(len(ZSTD_MAGIC)) == ZSTD_MAGIC
+            backup_file.seek(0)
+            
+            decompress = None
+            source = backup_file
+            if compressed:
+                if not self._zstd_bin:
+                    return 1, "Backup is zstd-compressed but the zstd command was not found"
+                decompress = subprocess.Popen(
+                    [self._zstd_bin, '-d', '-q', '-c'],
+                    stdin=backup_file, stdout=subprocess.PIPE
+                )
+                source = decompress.stdout
+            
             try:
-                old_backup.unlink()
-                # Also delete corresponding metadata if exists
-                metadata_file = self.backup_dir / "metadata" / f"{old_backup.stem}.json"
-                if metadata_file.exists():
-                    metadata_file.unlink()
-            except Exception as e:
-                print(f"⚠️  Warning: Could not delete old backup {old_backup.name}: {e}")
+                with subprocess.Popen(
+                    cmd, env=env, stdin=source,
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE
+                ) as proc:
+                    if decompress:
+                        # Only the consumer may hold the read end, so zstd gets
+                        # EOF/SIGPIPE instead of blocking once it exits
+                        decompress.stdout.close()
+                    try:
+                        stdout, stderr = proc.communicate(timeout=timeout)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+                        raise
+            except BaseException:
+                if decompress:
+                    decompress.kill()
+                    decompress.wait()
+                raise
+            
+            if decompress:
+                decompress.wait()
+        
+        # A consumer that stopped reading early leaves zstd with SIGPIPE, which
+        # is fine; any other zstd failure means the data fed in was incomplete
+        if decompress and decompress.returncode not in (0, -signal.SIGPIPE):
+            return decompress.returncode, "zstd decompression failed"
+        return proc.returncode, (stderr or stdout).decode(errors='replace')
+    
+    def _iter_backups(self, backup_type: str) -> List[os.DirEntry]:
+        """
+        List backup files of one type using a single os.scandir pass
+        (plain suffix check, no glob pattern compilation)
+        
+        Args:
+            backup_type: 'postgres' or 'milvus'
+        """
+        suffix = BACKUP_SUFFIXES[backup_type]
+        try:
+            with os.scandir(self._type_dirs[backup_type]) as entries:
+                return [
+                    entry for entry in entries
+                    if entry.name.endswith(suffix) and entry.is_file()
+                ]
+        except FileNotFoundError:
+            return []
+    
+    def _delete_backup(self, backup_file: Path) -> None:
+        """Delete a backup file and its metadata, warning instead of raising"""
+        try:
+            backup_file.unlink(missing_ok=True)
+            # Metadata is saved as <backup_name>.json (see _save_metadata)
+            metadata_file = self._meta_dir / f"{backup_file.name}.json"
+            metadata_file.unlink(missing_ok=True)
+        except Exception as e:
+            print(f"⚠️  Warning: Could not delete old backup {backup_file.name}: {e}")
+    
+    def _cleanup_old_backups(self, backup_type: str, keep: str) -> None:
+        """
+        Delete every backup of a type except the one named `keep`
+        Only needed when there is no CURRENT_BACKUP_MARKER to rotate from
+        
+        Args:
+            backup_type: 'postgres' or 'milvus'
+            keep: File name of the backup to keep
+        """
+        old_backups = [
+            Path(entry.path)
+            for entry in self._iter_backups(backup_type)
+            if entry.name != keep
+        ]
+        
+        for old_backup in old_backups:
+            self._delete_backup(old_backup)
+    
+    def _rotate_backups(self, backup_type: str, new_backup: Path) -> None:
+        """
+        Make new_backup the only kept backup of its type
+        The previous backup's name is read from the CURRENT_BACKUP_MARKER file,
+        so only that one file is deleted; the directory is scanned only when
+        no marker exists yet (first backup or an older backup layout)
+        
+        Args:
+            backup_type: 'postgres' or 'milvus'
+            new_backup: Path of the backup that was just written
+        """
+        marker = self._type_dirs[backup_type] / CURRENT_BACKUP_MARKER
+        try:
+            previous = marker.read_text().strip()
+        except FileNotFoundError:
+            previous = None
+        
+        tmp_marker = marker.with_name(marker.name + ".tmp")
+        tmp_marker.write_text(new_backup.name)
+        os.replace(tmp_marker, marker)
+        
+        if previous is None:
+            self._cleanup_old_backups(backup_type, keep=new_backup.name)
+        elif previous != new_backup.name:
+            self._delete_backup(new_backup.with_name(previous))
     
     def backup_postgres(self, backup_name: Optional[str] = None) -> Tuple[bool, str]:
         """
         Backup PostgreSQL database using pg_dump via Docker exec
-        Deletes old backups, keeping only the latest one
+        Once the backup succeeds the previous one is deleted, keeping only the latest
         
         Args:
             backup_name: Optional custom backup name (default: timestamp-based)
@@ -102,103 +456,34 @@ class BackupManager:
         Returns:
             Tuple of (success: bool, backup_path: str)
         """
-        # Clean up old backups before creating new one
-        self._cleanup_old_backups('postgres')
-        
         if not backup_name:
             timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
             backup_name = f"postgres_backup_{timestamp}.sql"
         
-        backup_path = self.backup_dir / "postgres" / backup_name
+        backup_path = self._pg_dir / backup_name
         
         try:
             # Check if Docker container is available
             use_docker = self._check_docker_container()
             
-            if use_docker:
-                # Use Docker exec to run pg_dump inside container
-                # This ensures version compatibility
-                container_backup_path = f"/tmp/{backup_name}"
-                
-                cmd = [
-                    'docker', 'exec',
-                    self.postgres_container,
-                    'pg_dump',
-                    '-U', POSTGRES_USER,
-                    '-d', POSTGRES_DB,
-                    '-F', 'c',  # Custom format (compressed)
-                    '-f', container_backup_path
-                ]
-                
-                # Set PGPASSWORD via environment in docker exec
-                env = os.environ.copy()
-                env['PGPASSWORD'] = POSTGRES_PASSWORD
-                
-                result = subprocess.run(
-                    cmd,
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    timeout=300  # 5 minute timeout
-                )
-                
-                if result.returncode == 0:
-                    # Copy backup file from container to host
-                    copy_cmd = [
-                        'docker', 'cp',
-                        f'{self.postgres_container}:{container_backup_path}',
-                        str(backup_path)
-                    ]
-                    
-                    copy_result = subprocess.run(
-                        copy_cmd,
-                        capture_output=True,
-                        text=True,
-                        timeout=60
-                    )
-                    
-                    if copy_result.returncode != 0:
-                        error_msg = f"Failed to copy backup from container: {copy_result.stderr}"
-                        print(f"❌ {error_msg}")
-                        return False, error_msg
-                    
-                    # Clean up backup file in container
-                    subprocess.run(
-                        ['docker', 'exec', self.postgres_container, 'rm', container_backup_path],
-                        capture_output=True,
-                        timeout=10
-                    )
-                else:
-                    error_msg = result.stderr or result.stdout
-                    print(f"❌ PostgreSQL backup failed: {error_msg}")
-                    return False, error_msg
-            else:
-                # Fallback to local pg_dump (if Docker not available)
-                env = os.environ.copy()
-                env['PGPASSWORD'] = POSTGRES_PASSWORD
-                
-                cmd = [
-                    'pg_dump',
-                    '-h', POSTGRES_HOST,
-                    '-p', str(POSTGRES_PORT),
-                    '-U', POSTGRES_USER,
-                    '-d', POSTGRES_DB,
-                    '-F', 'c',  # Custom format (compressed)
-                    '-f', str(backup_path)
-                ]
-                
-                result = subprocess.run(
-                    cmd,
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    timeout=300  # 5 minute timeout
+            # Docker exec runs pg_dump inside the container, which ensures
+            # version compatibility; otherwise fall back to local pg_dump
+            cmd = self._pg_dump_docker if use_docker else self._pg_dump_local
+            filter_cmd = self._zstd_compress_cmd
+            
+            # The dump is streamed over stdout into the backup file and
+            # checksummed in the same pass
+            with self._pgpass_env() as env:
+                returncode, stderr, checksum = self._stream_to_file(
+                    cmd, env, backup_path, timeout=300,  # 5 minute timeout
+                    filter_cmd=filter_cmd
                 )
-                
-                if result.returncode != 0:
-                    error_msg = result.stderr or result.stdout
-                    print(f"❌ PostgreSQL backup failed: {error_msg}")
-                    return False, error_msg
+            
+            if returncode != 0:
+                backup_path.unlink(missing_ok=True)
+                error_msg = stderr
+                print(f"❌ PostgreSQL backup failed: {error_msg}")
+                return False, error_msg
             
             # Save metadata
             metadata = {
@@ -209,9 +494,12 @@ class BackupManager:
                 "database": POSTGRES_DB,
                 "host": POSTGRES_HOST,
                 "port": POSTGRES_PORT,
-                "method": "docker" if use_docker else "local"
+                "method": "docker" if use_docker else "local",
+                "compression": "zstd" if filter_cmd else "pg_dump",
+                "blake2b": checksum
             }
             self._save_metadata(backup_name, metadata)
+            self._rotate_backups('postgres', backup_path)
             
             method_str = "Docker" if use_docker else "local"
             print(f"✅ PostgreSQL backup created via {method_str}: {backup_name}")
@@ -247,7 +535,7 @@ class BackupManager:
         Returns:
             Tuple of (success: bool, message: str)
         """
-        backup_path = self.backup_dir / "postgres" / backup_name
+        backup_path = self._pg_dir / backup_name
         
         if not backup_path.exists():
             error_msg = f"Backup file not found: {backup_path}"
@@ -258,171 +546,40 @@ class BackupManager:
             # Check if Docker container is available
             use_docker = self._check_docker_container()
             
-            env = os.environ.copy()
-            env['PGPASSWORD'] = POSTGRES_PASSWORD
-            
-            # If drop_existing, we need to drop and recreate the database
-            if drop_existing:
-                if use_docker:
-                    # Drop and create database using Docker exec
-                    drop_cmd = [
-                        'docker', 'exec',
-                        self.postgres_container,
-                        'psql',
-                        '-U', POSTGRES_USER,
-                        '-d', 'postgres',
-                        '-c', f'DROP DATABASE IF EXISTS {POSTGRES_DB};'
-                    ]
-                    
-                    drop_result = subprocess.run(
-                        drop_cmd,
-                        env=env,
-                        capture_output=True,
-                        text=True,
-                        timeout=60
-                    )
-                    
-                    if drop_result.returncode != 0:
-                        print(f"⚠️  Warning: Could not drop database: {drop_result.stderr}")
-                    
-                    create_cmd = [
-                        'docker', 'exec',
-                        self.postgres_container,
-                        'psql',
-                        '-U', POSTGRES_USER,
-                        '-d', 'postgres',
-                        '-c', f'CREATE DATABASE {POSTGRES_DB};'
-                    ]
-                    
-                    create_result = subprocess.run(
-                        create_cmd,
-                        env=env,
-                        capture_output=True,
-                        text=True,
-                        timeout=60
-                    )
-                    
-                    if create_result.returncode != 0:
-                        error_msg = f"Could not create database: {create_result.stderr}"
-                        print(f"❌ {error_msg}")
-                        return False, error_msg
-                else:
-                    # Fallback to local psql
-                    drop_cmd = [
-                        'psql',
-                        '-h', POSTGRES_HOST,
-                        '-p', str(POSTGRES_PORT),
-                        '-U', POSTGRES_USER,
-                        '-d', 'postgres',
-                        '-c', f'DROP DATABASE IF EXISTS {POSTGRES_DB};'
-                    ]
-                    
-                    drop_result = subprocess.run(
-                        drop_cmd,
-                        env=env,
-                        capture_output=True,
-                        text=True,
-                        timeout=60
-                    )
-                    
-                    if drop_result.returncode != 0:
-                        print(f"⚠️  Warning: Could not drop database: {drop_result.stderr}")
-                    
-                    create_cmd = [
-                        'psql',
-                        '-h', POSTGRES_HOST,
-                        '-p', str(POSTGRES_PORT),
-                        '-U', POSTGRES_USER,
-                        '-d', 'postgres',
-                        '-c', f'CREATE DATABASE {POSTGRES_DB};'
-                    ]
-                    
-                    create_result = subprocess.run(
-                        create_cmd,
+            # Restore from backup, streaming the file over stdin
+            if use_docker:
+                restore_cmd = self._pg_recreate_restore_docker if drop_existing else self._pg_restore_docker
+            else:
+                restore_cmd = self._pg_restore_local
+            
+            with self._pgpass_env() as env:
+                # If drop_existing, we need to drop and recreate the database
+                # Both statements go through one psql call; with Docker that call is
+                # folded into the restore exec below
+                if drop_existing and not use_docker:
+                    recreate_result = subprocess.run(
+                        self._psql_recreate_local,
                         env=env,
                         capture_output=True,
                         text=True,
                         timeout=60
                     )
                     
-                    if create_result.returncode != 0:
-                        error_msg = f"Could not create database: {create_result.stderr}"
+                    if recreate_result.returncode != 0:
+                        error_msg = f"Could not recreate database: {recreate_result.stderr}"
                         print(f"❌ {error_msg}")
                         return False, error_msg
-            
-            # Restore from backup
-            if use_docker:
-                # Copy backup file to container
-                container_backup_path = f"/tmp/{backup_name}"
-                copy_cmd = [
-                    'docker', 'cp',
-                    str(backup_path),
-                    f'{self.postgres_container}:{container_backup_path}'
-                ]
-                
-                copy_result = subprocess.run(
-                    copy_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-                
-                if copy_result.returncode != 0:
-                    error_msg = f"Failed to copy backup to container: {copy_result.stderr}"
-                    print(f"❌ {error_msg}")
-                    return False, error_msg
-                
-                # Restore using Docker exec
-                restore_cmd = [
-                    'docker', 'exec',
-                    self.postgres_container,
-                    'pg_restore',
-                    '-U', POSTGRES_USER,
-                    '-d', POSTGRES_DB,
-                    '-c',  # Clean (drop) existing objects
-                    container_backup_path
-                ]
-                
-                result = subprocess.run(
-                    restore_cmd,
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    timeout=600  # 10 minute timeout
-                )
                 
-                # Clean up backup file in container
-                subprocess.run(
-                    ['docker', 'exec', self.postgres_container, 'rm', container_backup_path],
-                    capture_output=True,
-                    timeout=10
-                )
-            else:
-                # Fallback to local pg_restore
-                restore_cmd = [
-                    'pg_restore',
-                    '-h', POSTGRES_HOST,
-                    '-p', str(POSTGRES_PORT),
-                    '-U', POSTGRES_USER,
-                    '-d', POSTGRES_DB,
-                    '-c',  # Clean (drop) existing objects
-                    str(backup_path)
-                ]
-                
-                result = subprocess.run(
-                    restore_cmd,
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    timeout=600  # 10 minute timeout
+                returncode, output = self._run_with_backup_stdin(
+                    restore_cmd, env, backup_path, timeout=600  # 10 minute timeout
                 )
             
-            if result.returncode == 0:
+            if returncode == 0:
                 method_str = "Docker" if use_docker else "local"
                 print(f"✅ PostgreSQL restore completed via {method_str}: {backup_name}")
                 return True, f"Successfully restored from {backup_name}"
             else:
-                error_msg = result.stderr or result.stdout
+                error_msg = output
                 print(f"❌ PostgreSQL restore failed: {error_msg}")
                 return False, error_msg
                 
@@ -445,7 +602,7 @@ class BackupManager:
     def backup_milvus(self, backup_name: Optional[str] = None) -> Tuple[bool, str]:
         """
         Backup Milvus Lite database by copying the .db file
-        Deletes old backups, keeping only the latest one
+        Once the backup succeeds the previous one is deleted, keeping only the latest
         
         Args:
             backup_name: Optional custom backup name (default: timestamp-based)
@@ -453,22 +610,14 @@ class BackupManager:
         Returns:
             Tuple of (success: bool, backup_path: str)
         """
-        # Clean up old backups before creating new one
-        self._cleanup_old_backups('milvus')
-        
         if not backup_name:
             timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
             backup_name = f"milvus_backup_{timestamp}.db"
         
-        backup_path = self.backup_dir / "milvus" / backup_name
+        backup_path = self._mv_dir / backup_name
         
         try:
-            # Convert relative path to absolute
-            milvus_path = Path(MILVUS_LITE_PATH)
-            if not milvus_path.is_absolute():
-                # Assume relative to backend directory
-                backend_dir = Path(__file__).parent.parent
-                milvus_path = backend_dir / MILVUS_LITE_PATH
+            milvus_path = self._milvus_path
             
             if not milvus_path.exists():
                 # Milvus file doesn't exist yet (first run), create empty backup metadata
@@ -485,7 +634,7 @@ class BackupManager:
                 return True, str(backup_path)
             
             # Copy the database file
-            shutil.copy2(milvus_path, backup_path)
+            self._copy_file(milvus_path, backup_path)
             
             # Save metadata
             metadata = {
@@ -497,6 +646,7 @@ class BackupManager:
                 "file_size": milvus_path.stat().st_size
             }
             self._save_metadata(backup_name, metadata)
+            self._rotate_backups('milvus', backup_path)
             
             print(f"✅ Milvus backup created: {backup_name}")
             return True, str(backup_path)
@@ -516,7 +666,7 @@ class BackupManager:
         Returns:
             Tuple of (success: bool, message: str)
         """
-        backup_path = self.backup_dir / "milvus" / backup_name
+        backup_path = self._mv_dir / backup_name
         
         if not backup_path.exists():
             error_msg = f"Backup file not found: {backup_path}"
@@ -524,17 +674,13 @@ class BackupManager:
             return False, error_msg
         
         try:
-            # Convert relative path to absolute
-            milvus_path = Path(MILVUS_LITE_PATH)
-            if not milvus_path.is_absolute():
-                backend_dir = Path(__file__).parent.parent
-                milvus_path = backend_dir / MILVUS_LITE_PATH
+            milvus_path = self._milvus_path
             
             # Ensure parent directory exists
             milvus_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Copy backup file to Milvus location
-            shutil.copy2(backup_path, milvus_path)
+            self._copy_file(backup_path, milvus_path)
             
             print(f"✅ Milvus restore completed: {backup_name}")
             return True, f"Successfully restored from {backup_name}"
@@ -564,16 +710,20 @@ class BackupManager:
             "success": False
         }
         
-        # Backup PostgreSQL
-        pg_success, pg_path = self.backup_postgres(f"{base_name}_postgres_{timestamp}.sql")
+        # PostgreSQL (pg_dump) and Milvus (file copy) are independent and
+        # I/O bound, so run them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pg_future = executor.submit(self.backup_postgres, f"{base_name}_postgres_{timestamp}.sql")
+            milvus_future = executor.submit(self.backup_milvus, f"{base_name}_milvus_{timestamp}.db")
+            pg_success, pg_path = pg_future.result()
+            milvus_success, milvus_path = milvus_future.result()
+        
         results["postgres"] = {
             "success": pg_success,
             "path": pg_path if pg_success else None,
             "error": None if pg_success else pg_path
         }
         
-        # Backup Milvus
-        milvus_success, milvus_path = self.backup_milvus(f"{base_name}_milvus_{timestamp}.db")
         results["milvus"] = {
             "success": milvus_success,
             "path": milvus_path if milvus_success else None,
@@ -619,111 +769,124 @@ class BackupManager:
         }
         
         # Find backup files with this timestamp
-        pg_backups = list((self.backup_dir / "postgres").glob(f"*{backup_timestamp}*.sql"))
-        milvus_backups = list((self.backup_dir / "milvus").glob(f"*{backup_timestamp}*.db"))
-        
-        if not pg_backups:
-            results["postgres"] = {
-                "success": False,
-                "error": f"No PostgreSQL backup found with timestamp: {backup_timestamp}"
-            }
-        else:
-            pg_success, pg_msg = self.restore_postgres(pg_backups[0].name, drop_existing)
-            results["postgres"] = {
-                "success": pg_success,
-                "message": pg_msg
-            }
-        
-        if not milvus_backups:
-            results["milvus"] = {
-                "success": False,
-                "error": f"No Milvus backup found with timestamp: {backup_timestamp}"
-            }
-        else:
-            milvus_success, milvus_msg = self.restore_milvus(milvus_backups[0].name)
-            results["milvus"] = {
-                "success": milvus_success,
-                "message": milvus_msg
-            }
+        pg_backups = [e for e in self._iter_backups("postgres") if backup_timestamp in e.name]
+        milvus_backups = [e for e in self._iter_backups("milvus") if backup_timestamp in e.name]
+        
+        # Restore both databases concurrently (see backup_all)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pg_future = None
+            milvus_future = None
+            if pg_backups:
+                pg_future = executor.submit(self.restore_postgres, pg_backups[0].name, drop_existing)
+            if milvus_backups:
+                milvus_future = executor.submit(self.restore_milvus, milvus_backups[0].name)
+            
+            if pg_future is None:
+                results["postgres"] = {
+                    "success": False,
+                    "error": f"No PostgreSQL backup found with timestamp: {backup_timestamp}"
+                }
+            else:
+                pg_success, pg_msg = pg_future.result()
+                results["postgres"] = {
+                    "success": pg_success,
+                    "message": pg_msg
+                }
+            
+            if milvus_future is None:
+                results["milvus"] = {
+                    "success": False,
+                    "error": f"No Milvus backup found with timestamp: {backup_timestamp}"
+                }
+            else:
+                milvus_success, milvus_msg = milvus_future.result()
+                results["milvus"] = {
+                    "success": milvus_success,
+                    "message": milvus_msg
+                }
         
         results["success"] = results["postgres"].get("success", False) and results["milvus"].get("success", False)
         
         return results
     
+    @staticmethod
+    def _describe_backup(entry: os.DirEntry) -> Dict[str, Any]:
+        """Build the API description of a backup file"""
+        st = entry.stat()
+        return {
+            "name": entry.name,
+            "path": entry.path,
+            "size": st.st_size,
+            "created": datetime.fromtimestamp(st.st_mtime).isoformat()
+        }
+    
+    @staticmethod
+    def _sort_newest_first(entries: List[os.DirEntry]) -> List[os.DirEntry]:
+        """
+        Sort backups newest first by the timestamp in their file name
+        (lexicographic order of YYYYMMDD_HHMMSS is chronological); files
+        without one fall back to mtime and sort after timestamped backups
+        """
+        def sort_key(entry: os.DirEntry):
+            match = BACKUP_TIMESTAMP_RE.search(entry.name)
+            if match:
+                return (1, match.group(1), 0.0)
+            return (0, "", entry.stat().st_mtime)
+        return sorted(entries, key=sort_key, reverse=True)
+    
     def list_backups(self) -> Dict[str, Any]:
         """
         List all available backups
         
         Returns:
-            Dictionary with lists of PostgreSQL and Milvus backups
-        """
-        pg_backups = []
-        milvus_backups = []
-        
-        # List PostgreSQL backups
-        for backup_file in (self.backup_dir / "postgres").glob("*.sql"):
-            pg_backups.append({
-                "name": backup_file.name,
-                "path": str(backup_file),
-                "size": backup_file.stat().st_size,
-                "created": datetime.fromtimestamp(backup_file.stat().st_mtime).isoformat()
-            })
-        
-        # List Milvus backups
-        for backup_file in (self.backup_dir / "milvus").glob("*.db"):
-            milvus_backups.append({
-                "name": backup_file.name,
-                "path": str(backup_file),
-                "size": backup_file.stat().st_size,
-                "created": datetime.fromtimestamp(backup_file.stat().st_mtime).isoformat()
-            })
-        
-        # Sort by creation time (newest first)
-        pg_backups.sort(key=lambda x: x["created"], reverse=True)
-        milvus_backups.sort(key=lambda x: x["created"], reverse=True)
+            Dictionary with lists of PostgreSQL and Milvus backups (newest first)
+        """
+        pg_entries = self._sort_newest_first(self._iter_backups("postgres"))
+        milvus_entries = self._sort_newest_first(self._iter_backups("milvus"))
         
         return {
-            "postgres": pg_backups,
-            "milvus": milvus_backups
+            "postgres": [self._describe_backup(entry) for entry in pg_entries],
+            "milvus": [self._describe_backup(entry) for entry in milvus_entries]
         }
     
     def _save_metadata(self, backup_name: str, metadata: Dict[str, Any]) -> None:
-        """Save backup metadata to JSON file"""
-        metadata_path = self.backup_dir / "metadata" / f"{backup_name}.json"
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        """
+        Save backup metadata to JSON file
+        Written to a temp file, fsync'ed and renamed into place so a crash
+        never leaves a truncated metadata file behind
+        """
+        metadata_path = self._meta_dir / f"{backup_name}.json"
+        tmp_path = metadata_path.with_name(metadata_path.name + ".tmp")
+        data = json.dumps(metadata, indent=2).encode()
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, metadata_path)
     
     def get_latest_backup(self) -> Optional[Dict[str, Any]]:
         """
         Get the most recent full backup
+        Pairs PostgreSQL and Milvus backups by the timestamp in their file
+        names (format: *_YYYYMMDD_HHMMSS.sql / .db); only the winning pair is stat'ed
         
         Returns:
             Dictionary with latest backup info or None
         """
-        backups = self.list_backups()
-        
-        if not backups["postgres"] or not backups["milvus"]:
-            return None
-        
-        # Find matching timestamps
         pg_timestamps = {}
-        milvus_timestamps = {}
-        
-        for pg in backups["postgres"]:
-            # Extract timestamp from filename (format: *_YYYYMMDD_HHMMSS.sql)
-            parts = pg["name"].split("_")
-            if len(parts) >= 3:
-                timestamp = "_".join(parts[-2:]).replace(".sql", "")
-                pg_timestamps[timestamp] = pg
+        for entry in self._iter_backups("postgres"):
+            match = BACKUP_TIMESTAMP_RE.search(entry.name)
+            if match:
+                pg_timestamps[match.group(1)] = entry
         
-        for milvus in backups["milvus"]:
-            parts = milvus["name"].split("_")
-            if len(parts) >= 3:
-                timestamp = "_".join(parts[-2:]).replace(".db", "")
-                milvus_timestamps[timestamp] = milvus
+        milvus_timestamps = {}
+        for entry in self._iter_backups("milvus"):
+            match = BACKUP_TIMESTAMP_RE.search(entry.name)
+            if match:
+                milvus_timestamps[match.group(1)] = entry
         
         # Find common timestamps
-        common_timestamps = set(pg_timestamps.keys()) & set(milvus_timestamps.keys())
+        common_timestamps = pg_timestamps.keys() & milvus_timestamps.keys()
         
         if not common_timestamps:
             return None
@@ -733,7 +896,6 @@ class BackupManager:
         
         return {
             "timestamp": latest_timestamp,
-            "postgres": pg_timestamps[latest_timestamp],
-            "milvus": milvus_timestamps[latest_timestamp]
+            "postgres": self._describe_backup(pg_timestamps[latest_timestamp]),
+            "milvus": self._describe_backup(milvus_timestamps[latest_timestamp])
         }
-
@@ -2,17 +2,19 @@
 Database Manager for RAG System
 Handles PostgreSQL and Milvus Lite database operations, synchronization, and verification
 """
+import io
 import os
 import hashlib
 import struct
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
-from datetime import datetime
-
-if TYPE_CHECKING:
-    from database.models import VerificationResult, VectorData
-from sqlalchemy import create_engine, Column, String, Text, DateTime, Integer, JSON
+import uuid
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import create_engine, bindparam, delete, distinct, exists, func, BigInteger, Column, Computed, ForeignKey, String, Text, DateTime, Index, Integer
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import deferred, relationship, sessionmaker, Session
 from pymilvus import MilvusClient
 import sys
 import os
@@ -20,11 +22,20 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import (
     POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD,
-    MILVUS_LITE_PATH, MILVUS_COLLECTION, MILVUS_METRIC_TYPE, EMBEDDING_DIM
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    MILVUS_LITE_PATH, MILVUS_COLLECTION, MILVUS_METRIC_TYPE, MILVUS_INSERT_BATCH_SIZE, EMBEDDING_DIM
 )
+from database.models import DocumentData, DocumentListItem, VerificationResult, VectorData
 
 Base = declarative_base()
 
+# Milvus Lite database file, resolved once at import (Milvus Lite requires a
+# path ending with .db; a directory gets milvus_lite.db inside it)
+MILVUS_PATH = Path(MILVUS_LITE_PATH).resolve()
+if MILVUS_PATH.suffix != ".db":
+    MILVUS_PATH = MILVUS_PATH / "milvus_lite.db"
+MILVUS_PATH.parent.mkdir(parents=True, exist_ok=True)
+
 
 # PostgreSQL Models
 class Document(Base):
@@ -32,21 +43,65 @@ class Document(Base):
     
     id = Column(String, primary_key=True)
     filename = Column(String, nullable=False)
-    full_text = Column(Text, nullable=False)
+    # Loaded only when accessed: listing/lookup queries never fetch the text
+    full_text = deferred(Column(Text, nullable=False))
+    full_text_length = Column(Integer, Computed("length(full_text)", persisted=True))
     file_hash = Column(String, nullable=False, unique=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     chunk_count = Column(Integer, default=0)
-    toc = Column(JSON, nullable=True)  # Table of contents structure
+    toc = Column(JSONB, nullable=True)  # Table of contents structure
+    # Lets the unit of work insert documents before their chunks; deletes are
+    # left to the database's ON DELETE CASCADE
+    chunks = relationship("Chunk", passive_deletes=True)
 
 
 class Chunk(Base):
     __tablename__ = "chunks"
+    # A document's chunks in chunk order, without a sort
+    __table_args__ = (Index("ix_chunks_doc_idx", "document_id", "chunk_index"),)
     
     id = Column(String, primary_key=True)
-    document_id = Column(String, nullable=False, index=True)
+    # Deleting a document deletes its chunks in PostgreSQL (ON DELETE CASCADE)
+    document_id = Column(String, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True)
     chunk_index = Column(Integer, nullable=False)
     text = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    milvus_id = Column(BigInteger, unique=True, index=True)  # int64 id of the chunk's vector in Milvus
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+# Bulk deletes built once so every call reuses the same compiled statement.
+# synchronize_session=False: the session never holds these rows, so there is
+# nothing to sync and no need for a SELECT before the DELETE
+_NO_SYNC = {"synchronize_session": False}
+DELETE_ALL_CHUNKS = delete(Chunk).execution_options(**_NO_SYNC)
+DELETE_ALL_DOCUMENTS = delete(Document).execution_options(**_NO_SYNC)
+DELETE_DOCUMENT = delete(Document).where(
+    Document.id == bindparam("document_id")
+).execution_options(**_NO_SYNC)
+# Only needed while chunks.document_id lacks its ON DELETE CASCADE key
+DELETE_DOCUMENT_CHUNKS = delete(Chunk).where(
+    Chunk.document_id == bindparam("document_id")
+).execution_options(**_NO_SYNC)
+
+# Binary COPY for bulk document loads: rows are streamed in one COPY instead
+# of one INSERT (Parse/Bind/Execute + text escaping) per row
+COPY_DOCUMENTS_SQL = (
+    "COPY documents (id, filename, full_text, file_hash, chunk_count) "
+    "FROM STDIN WITH (FORMAT BINARY)"
+)
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_COPY_TRAILER = struct.pack("!h", -1)
+
+
+def _copy_document_row(doc: 'DocumentData') -> bytes:
+    """Encode one document as a binary COPY tuple (text fields as UTF-8, chunk_count as int4)"""
+    parts = [struct.pack("!h", 5)]
+    for value in (doc.id, doc.filename, doc.full_text, doc.file_hash):
+        encoded = value.encode("utf-8")
+        parts.append(struct.pack("!i", len(encoded)))
+        parts.append(encoded)
+    parts.append(struct.pack("!ii", 4, doc.chunk_count or 0))
+    return b"".join(parts)
 
 
 class DatabaseManager:
@@ -63,6 +118,17 @@ class DatabaseManager:
         self.embedding_dim = EMBEDDING_DIM
         self._postgres_initialized = False
         self._milvus_initialized = False
+        # Whether deleting a document cascades to its chunks inside PostgreSQL
+        self._chunks_cascade = False
+        # Collection existence/description cached after _ensure_collection()
+        # (invalidated when clean_all drops the collection)
+        self._collection_ready = False
+        self._collection_info: Optional[Dict] = None
+    
+    @property
+    def collection_ready(self) -> bool:
+        """Whether the Milvus collection is known to exist (no RPC)"""
+        return self._collection_ready
     
     def initialize(self):
         """Initialize both PostgreSQL and Milvus Lite connections"""
@@ -74,22 +140,75 @@ class DatabaseManager:
         """Initialize PostgreSQL connection"""
         db_url = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
         try:
-            self.engine = create_engine(db_url, pool_pre_ping=True)
+            # Batch executemany(): INSERTs become multi-row VALUES statements
+            # and UPDATE/DELETE batches go through psycopg2's execute_batch
+            self.engine = create_engine(
+                db_url,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_recycle=DB_POOL_RECYCLE,
+                pool_pre_ping=DB_POOL_PRE_PING,
+                query_cache_size=1200,  # Compiled-statement cache entries
+                executemany_mode="values_plus_batch",
+                insertmanyvalues_page_size=1000,
+                executemany_batch_page_size=500
+            )
             Base.metadata.create_all(self.engine)
             
-            # Ensure toc column exists (for backward compatibility)
-            from sqlalchemy import inspect, text
-            inspector = inspect(self.engine)
-            if inspector.has_table("documents"):
-                columns = [col['name'] for col in inspector.get_columns("documents")]
-                if 'toc' not in columns:
-                    try:
-                        with self.engine.connect() as conn:
-                            conn.execute(text("ALTER TABLE documents ADD COLUMN toc JSON"))
-                            conn.commit()
-                        print("✅ Added 'toc' column to documents table")
-                    except Exception as e:
-                        print(f"⚠️  Could not add 'toc' column (may already exist): {e}")
+            # Ensure toc column exists as JSONB (for backward compatibility)
+            from database.migrate_add_toc import ensure_toc_column
+            try:
+                with self.engine.connect() as conn:
+                    ensure_toc_column(conn)
+            except Exception as e:
+                print(f"⚠️  Could not ensure 'toc' column: {e}")
+            
+            # Ensure chunks cascade-delete with their document (for backward compatibility)
+            from database.migrate_add_chunk_fk import has_chunk_fk, add_chunk_fk
+            self._chunks_cascade = has_chunk_fk(self.engine)
+            if not self._chunks_cascade:
+                try:
+                    add_chunk_fk(self.engine)
+                    self._chunks_cascade = True
+                    print("✅ Added cascading foreign key to chunks table")
+                except Exception as e:
+                    print(f"⚠️  Could not add chunks foreign key: {e}")
+            
+            # Ensure milvus_id column exists (for backward compatibility)
+            from database.migrate_add_milvus_id import has_milvus_id_column, add_milvus_id_column
+            if not has_milvus_id_column(self.engine):
+                try:
+                    backfilled = add_milvus_id_column(self.engine)
+                    print(f"✅ Added 'milvus_id' column to chunks table ({backfilled} chunks backfilled)")
+                except Exception as e:
+                    print(f"⚠️  Could not add 'milvus_id' column: {e}")
+            
+            # Ensure created_at is filled in by PostgreSQL (for backward compatibility)
+            from database.migrate_created_at_default import needs_created_at_default, set_created_at_default
+            if needs_created_at_default(self.engine):
+                try:
+                    set_created_at_default(self.engine)
+                    print("✅ Set server-side created_at defaults on documents and chunks")
+                except Exception as e:
+                    print(f"⚠️  Could not set created_at defaults: {e}")
+            
+            # Ensure full_text_length column exists (for backward compatibility)
+            from database.migrate_add_full_text_length import has_full_text_length_column, add_full_text_length_column
+            if not has_full_text_length_column(self.engine):
+                try:
+                    add_full_text_length_column(self.engine)
+                    print("✅ Added 'full_text_length' column to documents table")
+                except Exception as e:
+                    print(f"⚠️  Could not add 'full_text_length' column: {e}")
+            
+            # Ensure the (document_id, chunk_index) index exists (for backward compatibility)
+            from database.migrate_add_chunk_index import has_chunk_index, add_chunk_index
+            if not has_chunk_index(self.engine):
+                try:
+                    add_chunk_index(self.engine)
+                    print("✅ Added (document_id, chunk_index) index to chunks table")
+                except Exception as e:
+                    print(f"⚠️  Could not add chunks (document_id, chunk_index) index: {e}")
             
             self.SessionLocal = sessionmaker(bind=self.engine)
             self._postgres_initialized = True
@@ -113,17 +232,7 @@ class DatabaseManager:
     
     def _init_milvus(self):
         """Initialize Milvus Lite connection"""
-        # Convert relative path to absolute path
-        milvus_path = os.path.abspath(MILVUS_LITE_PATH)
-        
-        # Ensure the path ends with .db (Milvus Lite requires this)
-        if not milvus_path.endswith('.db'):
-            milvus_path = os.path.join(milvus_path, 'milvus_lite.db')
-        
-        # Ensure the directory exists
-        milvus_dir = os.path.dirname(milvus_path)
-        if milvus_dir and not os.path.exists(milvus_dir):
-            os.makedirs(milvus_dir, exist_ok=True)
+        milvus_path = str(MILVUS_PATH)
         
         # Milvus Lite expects a local file path ending with .db (no file:// prefix needed)
         try:
@@ -139,13 +248,15 @@ class DatabaseManager:
             troubleshooting += f"      Current path: {MILVUS_LITE_PATH}\n"
             troubleshooting += f"      Resolved to: {milvus_path}\n"
             troubleshooting += "   3. Ensure the directory exists and is writable:\n"
-            troubleshooting += f"      Directory: {milvus_dir}\n"
+            troubleshooting += f"      Directory: {MILVUS_PATH.parent}\n"
             troubleshooting += "   4. For WSL, ensure paths are accessible\n"
             raise ConnectionError(f"Failed to initialize Milvus Lite\n{error_msg}{troubleshooting}")
         
         print(f"✅ Initialized Milvus Lite: {milvus_path}")
-        
-        # Check if collection exists, create if not
+        self._ensure_collection()
+    
+    def _ensure_collection(self):
+        """Create the Milvus collection if it does not exist yet"""
         if not self.milvus_client.has_collection(self.collection_name):
             # Create collection with vector dimension
             # Note: Milvus requires id field to be int64, so we convert UUID strings to int64
@@ -160,8 +271,16 @@ class DatabaseManager:
         else:
             print(f"✅ Using existing Milvus Lite collection: {self.collection_name}")
             print(f"   Note: If you see ID type errors, delete the collection to recreate with correct schema")
+        self._collection_ready = True
+    
+    def _describe_collection(self) -> Dict:
+        """describe_collection() result, fetched once per collection"""
+        if self._collection_info is None:
+            self._collection_info = self.milvus_client.describe_collection(self.collection_name)
+        return self._collection_info
     
     @staticmethod
+    @lru_cache(maxsize=100_000)
     def _uuid_to_int64(uuid_str: str) -> int:
         """Convert UUID string to int64 for Milvus (uses MD5 hash)"""
         hash_bytes = hashlib.md5(uuid_str.encode()).digest()[:8]
@@ -173,13 +292,16 @@ class DatabaseManager:
             raise RuntimeError("PostgreSQL not initialized. Call initialize() first.")
         return self.SessionLocal()
     
-    def verify(self) -> 'VerificationResult':
+    def verify(self, sample_docs: Optional[int] = 200) -> 'VerificationResult':
         """
         General verification method - checks both databases and synchronization
         Returns comprehensive verification status as VerificationResult data class
-        """
-        from database.models import VerificationResult, DocumentListItem
         
+        Args:
+            sample_docs: Maximum number of (most recent) documents listed in
+                details["postgres"]["documents"]; None lists all of them.
+                Totals are always exact.
+        """
         verification_result = VerificationResult(
             postgres_connected=False,
             milvus_connected=False,
@@ -196,12 +318,20 @@ class DatabaseManager:
             try:
                 db = self.get_session()
                 try:
-                    postgres_docs = db.query(Document).all()
-                    postgres_chunks = db.query(Chunk).all()
+                    # Only the listed columns are loaded (never full_text);
+                    # the rows expose them as attributes, like the ORM model
+                    docs_query = db.query(
+                        Document.id, Document.filename, Document.chunk_count, Document.created_at
+                    ).order_by(Document.created_at.desc())
+                    if sample_docs is not None:
+                        docs_query = docs_query.limit(sample_docs)
+                    postgres_docs = docs_query.all()
+                    postgres_documents = db.query(func.count(Document.id)).scalar()
+                    postgres_chunks = db.query(func.count(Chunk.id)).scalar()
                     
                     verification_result.postgres_connected = True
-                    verification_result.postgres_documents = len(postgres_docs)
-                    verification_result.postgres_chunks = len(postgres_chunks)
+                    verification_result.postgres_documents = postgres_documents
+                    verification_result.postgres_chunks = postgres_chunks
                     
                     verification_result.details["postgres"] = {
                         "documents": [
@@ -217,12 +347,12 @@ class DatabaseManager:
         # Verify Milvus
         if self._milvus_initialized and self.milvus_client:
             try:
-                if self.milvus_client.has_collection(self.collection_name):
+                if self._collection_ready:
                     verification_result.milvus_connected = True
                     
                     # Get collection info
                     try:
-                        collection_info = self.milvus_client.describe_collection(self.collection_name)
+                        collection_info = self._describe_collection()
                         verification_result.details["milvus"] = {
                             "collection_name": collection_info.get('collection_name', 'N/A'),
                             "description": collection_info.get('description', 'N/A')
@@ -230,15 +360,14 @@ class DatabaseManager:
                     except:
                         pass
                     
-                    # Count vectors
+                    # Count vectors (server-side count, no rows transferred)
                     try:
-                        all_data = self.milvus_client.query(
+                        count_result = self.milvus_client.query(
                             collection_name=self.collection_name,
                             filter="",
-                            limit=10000,
-                            output_fields=["id", "document_id", "chunk_index"]
+                            output_fields=["count(*)"]
                         )
-                        verification_result.milvus_vectors = len(all_data) if all_data else 0
+                        verification_result.milvus_vectors = count_result[0]["count(*)"] if count_result else 0
                     except Exception as e:
                         verification_result.issues.append(f"Could not query Milvus vectors: {e}")
                 else:
@@ -268,34 +397,26 @@ class DatabaseManager:
         try:
             print("🧹 Cleaning all databases...")
             
-            # Get all chunk IDs from PostgreSQL before deletion
-            all_chunks = db.query(Chunk).all()
-            chunk_ids_str = [chunk.id for chunk in all_chunks]
+            # Count what is about to be deleted (for the summary)
+            chunk_count = db.query(func.count(Chunk.id)).scalar()
+            document_count = db.query(func.count(distinct(Chunk.document_id))).scalar()
             
             # Delete all from PostgreSQL
-            db.query(Chunk).delete()
-            db.query(Document).delete()
+            db.execute(DELETE_ALL_CHUNKS)
+            db.execute(DELETE_ALL_DOCUMENTS)
             db.commit()
-            print(f"✅ Cleared PostgreSQL: {len(all_chunks)} chunks, {len(set(c.document_id for c in all_chunks))} documents")
+            print(f"✅ Cleared PostgreSQL: {chunk_count} chunks, {document_count} documents")
             
-            # Delete all from Milvus Lite
-            if chunk_ids_str:
-                chunk_ids_int = [self._uuid_to_int64(chunk_id) for chunk_id in chunk_ids_str]
-                try:
-                    self.milvus_client.delete(
-                        collection_name=self.collection_name,
-                        ids=chunk_ids_int
-                    )
-                    print(f"✅ Cleared Milvus Lite: {len(chunk_ids_int)} vectors")
-                except Exception as e:
-                    print(f"⚠️  Error clearing Milvus Lite: {e}")
-                    # Try to drop and recreate collection as fallback
-                    try:
-                        if self.milvus_client.has_collection(self.collection_name):
-                            self.milvus_client.drop_collection(self.collection_name)
-                            print("✅ Dropped Milvus collection")
-                    except Exception as drop_error:
-                        print(f"⚠️  Could not drop collection: {drop_error}")
+            # Delete all from Milvus Lite: dropping and recreating the collection
+            # is a single call instead of deleting every vector by id
+            try:
+                self._collection_ready = False
+                self._collection_info = None
+                self.milvus_client.drop_collection(self.collection_name)
+                self._ensure_collection()
+                print(f"✅ Cleared Milvus Lite: {chunk_count} vectors")
+            except Exception as e:
+                print(f"⚠️  Error clearing Milvus Lite: {e}")
             
             print("✅ All databases cleaned successfully")
         except Exception as e:
@@ -312,30 +433,31 @@ class DatabaseManager:
         if not self._milvus_initialized:
             raise RuntimeError("Milvus not initialized")
         
+        # The id ends up in a Milvus filter expression: only a canonical UUID string is allowed
+        # (raises ValueError otherwise)
+        document_id = str(uuid.UUID(document_id))
+        
         db = self.get_session()
         try:
-            # Get chunk IDs before deleting from PostgreSQL
-            chunks = db.query(Chunk).filter(Chunk.document_id == document_id).all()
-            chunk_ids_str = [chunk.id for chunk in chunks]
-            
             # Delete from PostgreSQL first
-            db.query(Chunk).filter(Chunk.document_id == document_id).delete()
-            db.query(Document).filter(Document.id == document_id).delete()
+            # Chunks go with the document via ON DELETE CASCADE once the key exists
+            if not self._chunks_cascade:
+                db.execute(DELETE_DOCUMENT_CHUNKS, {"document_id": document_id})
+            db.execute(DELETE_DOCUMENT, {"document_id": document_id})
             db.commit()
             
-            # Delete from Milvus Lite (convert UUID strings to int64)
-            if chunk_ids_str:
-                chunk_ids_int = [self._uuid_to_int64(chunk_id) for chunk_id in chunk_ids_str]
-                try:
-                    self.milvus_client.delete(
-                        collection_name=self.collection_name,
-                        ids=chunk_ids_int
-                    )
-                except Exception as milvus_error:
-                    # If Milvus delete fails, rollback PostgreSQL
-                    db.rollback()
-                    print(f"⚠️  Milvus delete failed, rolling back PostgreSQL: {milvus_error}")
-                    raise
+            # Delete from Milvus Lite by document_id (one filter expression,
+            # no per-chunk id lookup or hashing)
+            try:
+                self.milvus_client.delete(
+                    collection_name=self.collection_name,
+                    filter=f'document_id == "{document_id}"'
+                )
+            except Exception as milvus_error:
+                # If Milvus delete fails, rollback PostgreSQL
+                db.rollback()
+                print(f"⚠️  Milvus delete failed, rolling back PostgreSQL: {milvus_error}")
+                raise
             
             print(f"✅ Deleted document: {document_id} from both databases")
         except Exception as e:
@@ -345,6 +467,90 @@ class DatabaseManager:
         finally:
             db.close()
     
+    def delete_orphaned_chunks(self) -> int:
+        """
+        Delete chunks whose document no longer exists from both databases
+        Their vectors are removed from Milvus first, so if that fails the
+        PostgreSQL rows are still there for a retry
+        
+        Returns:
+            Number of chunks deleted
+        """
+        if not self._postgres_initialized:
+            raise RuntimeError("PostgreSQL not initialized")
+        if not self._milvus_initialized:
+            raise RuntimeError("Milvus not initialized")
+        
+        db = self.get_session()
+        try:
+            orphans = db.query(Chunk.id, Chunk.milvus_id).filter(
+                ~exists().where(Document.id == Chunk.document_id)
+            ).all()
+            if not orphans:
+                return 0
+            
+            self.milvus_client.delete(
+                collection_name=self.collection_name,
+                ids=[
+                    milvus_id if milvus_id is not None else self._uuid_to_int64(chunk_id)
+                    for chunk_id, milvus_id in orphans
+                ]
+            )
+            db.execute(
+                delete(Chunk).where(Chunk.id.in_([chunk_id for chunk_id, _ in orphans]))
+                .execution_options(**_NO_SYNC)
+            )
+            db.commit()
+            
+            print(f"✅ Deleted {len(orphans)} orphaned chunks from both databases")
+            return len(orphans)
+        except Exception as e:
+            db.rollback()
+            print(f"Error deleting orphaned chunks: {e}")
+            raise
+        finally:
+            db.close()
+    
+    def bulk_insert_documents(self, docs: List['DocumentData']) -> int:
+        """
+        Insert many documents with a single binary COPY
+        created_at comes from the column default and toc is left NULL
+        
+        Args:
+            docs: Documents to insert (ids and file hashes must be new)
+            
+        Returns:
+            Number of documents inserted
+        """
+        if not self._postgres_initialized:
+            raise RuntimeError("PostgreSQL not initialized")
+        if not docs:
+            return 0
+        
+        stream = io.BytesIO()
+        stream.write(_COPY_HEADER)
+        for doc in docs:
+            stream.write(_copy_document_row(doc))
+        stream.write(_COPY_TRAILER)
+        stream.seek(0)
+        
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            cursor.copy_expert(COPY_DOCUMENTS_SQL, stream)
+            inserted = cursor.rowcount
+            cursor.close()
+            raw_conn.commit()
+        except Exception as e:
+            raw_conn.rollback()
+            print(f"Error bulk inserting documents: {e}")
+            raise
+        finally:
+            raw_conn.close()
+        
+        print(f"✅ Bulk inserted {inserted} documents")
+        return inserted
+    
     def insert_vectors(self, vectors_data: List['VectorData']):
         """
         Insert vectors into Milvus
@@ -354,15 +560,16 @@ class DatabaseManager:
         if not self._milvus_initialized:
             raise RuntimeError("Milvus not initialized")
         
-        if vectors_data:
-            # Convert VectorData objects to dicts for Milvus
-            # Import here to avoid circular imports
-            from database.models import VectorData as VectorDataClass
-            clean_data = [vec.to_dict() for vec in vectors_data]
-            
+        # Convert VectorData objects to dicts lazily and insert them in
+        # fixed-size batches, so a large re-sync never builds one huge request
+        rows = (vec.to_dict() for vec in vectors_data)
+        while True:
+            batch = list(islice(rows, MILVUS_INSERT_BATCH_SIZE))
+            if not batch:
+                break
             self.milvus_client.insert(
                 collection_name=self.collection_name,
-                data=clean_data
+                data=batch
             )
     
     def search_vectors(self, query_vector: List[float], top_k: int, output_fields: List[str] = None) -> List:
@@ -407,4 +614,6 @@ class DatabaseManager:
         # Milvus Lite doesn't need explicit closing
         self._postgres_initialized = False
         self._milvus_initialized = False
+        self._collection_ready = False
+        self._collection_info = None
 
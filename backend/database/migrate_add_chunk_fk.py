@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Migration script to add a cascading foreign key from chunks to documents
+With it, deleting a document row also deletes its chunks inside PostgreSQL
+
+Chunks whose document no longer exists block the constraint. They are only
+reported unless --delete-orphans is passed, which removes them together with
+their Milvus vectors
+"""
+import os
+import sys
+from sqlalchemy import create_engine, text, inspect
+
+# Add parent directory to path to import config
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD
+)
+
+# Chunks whose document row is gone
+ORPHANED_CHUNKS_WHERE = "NOT EXISTS (SELECT 1 FROM documents WHERE documents.id = chunks.document_id)"
+
+
+def has_chunk_fk(engine) -> bool:
+    """Check whether chunks.document_id already references documents.id"""
+    return any(
+        fk['referred_table'] == "documents" and fk['constrained_columns'] == ["document_id"]
+        for fk in inspect(engine).get_foreign_keys("chunks")
+    )
+
+
+def count_orphaned_chunks(engine) -> int:
+    """Count chunks whose document no longer exists"""
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT count(*) FROM chunks WHERE {ORPHANED_CHUNKS_WHERE}")).scalar()
+
+
+def add_chunk_fk(engine):
+    """
+    Add the cascading foreign key
+    Orphaned chunks are never deleted here (their vectors would stay behind in Milvus)
+    
+    Raises:
+        RuntimeError: If chunks reference missing documents
+    """
+    orphaned = count_orphaned_chunks(engine)
+    if orphaned:
+        raise RuntimeError(
+            f"{orphaned} chunks reference missing documents; remove them with "
+            f"`python database/migrate_add_chunk_fk.py --delete-orphans`"
+        )
+    with engine.connect() as conn:
+        conn.execute(text(
+            "ALTER TABLE chunks ADD CONSTRAINT chunks_document_id_fkey "
+            "FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE"
+        ))
+        conn.commit()
+
+
+def migrate_add_chunk_fk(delete_orphans: bool = False):
+    """
+    Add chunks.document_id -> documents.id foreign key (ON DELETE CASCADE) if missing
+    
+    Args:
+        delete_orphans: Delete chunks whose document is gone (and their Milvus vectors) first
+    """
+    db_url = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    
+    try:
+        engine = create_engine(db_url, pool_pre_ping=True)
+        inspector = inspect(engine)
+        
+        # Check if both tables exist
+        if not inspector.has_table("documents") or not inspector.has_table("chunks"):
+            print("❌ Documents/chunks tables do not exist. Please initialize the database first.")
+            return False
+        
+        # Check if the foreign key already exists
+        if has_chunk_fk(engine):
+            print("✅ Foreign key chunks.document_id -> documents.id already exists")
+            return True
+        
+        orphaned = count_orphaned_chunks(engine)
+        if orphaned:
+            if not delete_orphans:
+                print(f"❌ {orphaned} chunks reference missing documents")
+                print("   Re-run with --delete-orphans to delete them and their Milvus vectors")
+                return False
+            
+            from database.database_manager import DatabaseManager
+            db_manager = DatabaseManager()
+            try:
+                if not db_manager.initialize():
+                    print("❌ Could not connect to PostgreSQL and Milvus Lite")
+                    return False
+                removed = db_manager.delete_orphaned_chunks()
+            finally:
+                db_manager.close()
+            print(f"   Removed {removed} orphaned chunks and their vectors")
+        
+        print("🔄 Adding foreign key chunks.document_id -> documents.id...")
+        add_chunk_fk(engine)
+        
+        print("✅ Successfully added foreign key with ON DELETE CASCADE")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error adding foreign key: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if 'engine' in locals():
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    print("🚀 Running migration: Add cascading foreign key from chunks to documents")
+    print("=" * 60)
+    success = migrate_add_chunk_fk(delete_orphans="--delete-orphans" in sys.argv[1:])
+    print("=" * 60)
+    if success:
+        print("✅ Migration completed successfully")
+        sys.exit(0)
+    else:
+        print("❌ Migration failed")
+        sys.exit(1)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the (document_id, chunk_index) index to chunks table
+Chunks of one document are read and deleted in chunk order through this index
+"""
+import os
+import sys
+from sqlalchemy import create_engine, text, inspect
+
+# Add parent directory to path to import config
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD
+)
+
+CHUNK_INDEX_NAME = "ix_chunks_doc_idx"
+
+
+def has_chunk_index(engine) -> bool:
+    """Check whether the (document_id, chunk_index) index exists"""
+    return any(ix['name'] == CHUNK_INDEX_NAME for ix in inspect(engine).get_indexes("chunks"))
+
+
+def add_chunk_index(engine) -> None:
+    """
+    Build the index with CREATE INDEX CONCURRENTLY, so writes to chunks are not
+    blocked while it builds (this cannot run inside a transaction)
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {CHUNK_INDEX_NAME} "
+            f"ON chunks (document_id, chunk_index)"
+        ))
+
+
+def migrate_add_chunk_index():
+    """Add (document_id, chunk_index) index to chunks table if it doesn't exist"""
+    db_url = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    
+    try:
+        engine = create_engine(db_url, pool_pre_ping=True)
+        inspector = inspect(engine)
+        
+        # Check if chunks table exists
+        if not inspector.has_table("chunks"):
+            print("❌ Chunks table does not exist. Please initialize the database first.")
+            return False
+        
+        # Check if the index already exists
+        if has_chunk_index(engine):
+            print(f"✅ Index '{CHUNK_INDEX_NAME}' already exists on chunks table")
+            return True
+        
+        print(f"🔄 Creating index '{CHUNK_INDEX_NAME}' on chunks (document_id, chunk_index)...")
+        add_chunk_index(engine)
+        
+        print(f"✅ Successfully created index '{CHUNK_INDEX_NAME}'")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error creating index '{CHUNK_INDEX_NAME}': {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if 'engine' in locals():
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    print("🚀 Running migration: Add (document_id, chunk_index) index to chunks table")
+    print("=" * 60)
+    success = migrate_add_chunk_index()
+    print("=" * 60)
+    if success:
+        print("✅ Migration completed successfully")
+        sys.exit(0)
+    else:
+        print("❌ Migration failed")
+        sys.exit(1)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Migration script to add 'full_text_length' column to documents table
+A generated column, so document lengths are read without loading full_text
+"""
+import os
+import sys
+from sqlalchemy import create_engine, text, inspect
+
+# Add parent directory to path to import config
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD
+)
+
+ADD_FULL_TEXT_LENGTH_SQL = (
+    "ALTER TABLE documents ADD COLUMN IF NOT EXISTS full_text_length INTEGER "
+    "GENERATED ALWAYS AS (length(full_text)) STORED"
+)
+
+
+def has_full_text_length_column(engine) -> bool:
+    """Check whether documents.full_text_length exists"""
+    return 'full_text_length' in [col['name'] for col in inspect(engine).get_columns("documents")]
+
+
+def add_full_text_length_column(engine) -> None:
+    """Add documents.full_text_length (PostgreSQL computes it for existing rows)"""
+    with engine.connect() as conn:
+        conn.execute(text(ADD_FULL_TEXT_LENGTH_SQL))
+        conn.commit()
+
+
+def migrate_add_full_text_length_column():
+    """Add full_text_length column to documents table if it doesn't exist"""
+    db_url = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    
+    try:
+        engine = create_engine(db_url, pool_pre_ping=True)
+        inspector = inspect(engine)
+        
+        # Check if documents table exists
+        if not inspector.has_table("documents"):
+            print("❌ Documents table does not exist. Please initialize the database first.")
+            return False
+        
+        # Check if full_text_length column already exists
+        if has_full_text_length_column(engine):
+            print("✅ Column 'full_text_length' already exists in documents table")
+            return True
+        
+        print("🔄 Adding 'full_text_length' column to documents table...")
+        add_full_text_length_column(engine)
+        
+        print("✅ Successfully added 'full_text_length' column to documents table")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error adding 'full_text_length' column: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if 'engine' in locals():
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    print("🚀 Running migration: Add full_text_length column to documents table")
+    print("=" * 60)
+    success = migrate_add_full_text_length_column()
+    print("=" * 60)
+    if success:
+        print("✅ Migration completed successfully")
+        sys.exit(0)
+    else:
+        print("❌ Migration failed")
+        sys.exit(1)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Migration script to add 'milvus_id' column to chunks table
+Stores each chunk's int64 Milvus id so it is read back instead of recomputed
+"""
+import os
+import sys
+from sqlalchemy import create_engine, text, inspect
+
+# Add parent directory to path to import config
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD
+)
+
+# Same value as DatabaseManager._uuid_to_int64: first 8 bytes of md5(id) as a signed int64
+BACKFILL_MILVUS_ID_SQL = """
+UPDATE chunks SET milvus_id = ('x' || substr(md5(id), 1, 16))::bit(64)::bigint
+WHERE milvus_id IS NULL
+"""
+
+
+def has_milvus_id_column(engine) -> bool:
+    """Check whether chunks.milvus_id exists"""
+    return 'milvus_id' in [col['name'] for col in inspect(engine).get_columns("chunks")]
+
+
+def add_milvus_id_column(engine) -> int:
+    """
+    Add chunks.milvus_id (unique, indexed) and backfill it for existing chunks
+    Returns the number of chunks backfilled
+    """
+    with engine.connect() as conn:
+        conn.execute(text("ALTER TABLE chunks ADD COLUMN IF NOT EXISTS milvus_id BIGINT"))
+        result = conn.execute(text(BACKFILL_MILVUS_ID_SQL))
+        conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_chunks_milvus_id ON chunks (milvus_id)"))
+        conn.commit()
+    return result.rowcount
+
+
+def migrate_add_milvus_id_column():
+    """Add milvus_id column to chunks table if it doesn't exist"""
+    db_url = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    
+    try:
+        engine = create_engine(db_url, pool_pre_ping=True)
+        inspector = inspect(engine)
+        
+        # Check if chunks table exists
+        if not inspector.has_table("chunks"):
+            print("❌ Chunks table does not exist. Please initialize the database first.")
+            return False
+        
+        # Check if milvus_id column already exists
+        if has_milvus_id_column(engine):
+            print("✅ Column 'milvus_id' already exists in chunks table")
+            return True
+        
+        print("🔄 Adding 'milvus_id' column to chunks table...")
+        backfilled = add_milvus_id_column(engine)
+        print(f"   Backfilled milvus_id for {backfilled} chunks")
+        
+        print("✅ Successfully added 'milvus_id' column to chunks table")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error adding 'milvus_id' column: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if 'engine' in locals():
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    print("🚀 Running migration: Add milvus_id column to chunks table")
+    print("=" * 60)
+    success = migrate_add_milvus_id_column()
+    print("=" * 60)
+    if success:
+        print("✅ Migration completed successfully")
+        sys.exit(0)
+    else:
+        print("❌ Migration failed")
+        sys.exit(1)
@@ -5,8 +5,7 @@ This adds the table of contents column that was introduced for the TOC feature
 """
 import os
 import sys
-from dotenv import load_dotenv
-from sqlalchemy import create_engine, text, inspect
+from sqlalchemy import create_engine, text
 
 # Add parent directory to path to import config
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,8 +14,45 @@ from config import (
     POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD
 )
 
-# Load environment variables
-load_dotenv()
+# Table and column existence in one round trip
+TOC_COLUMN_STATE_SQL = text("""
+SELECT
+    EXISTS (SELECT 1 FROM information_schema.tables
+            WHERE table_schema = current_schema() AND table_name = 'documents') AS has_table,
+    EXISTS (SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'documents'
+              AND column_name = 'toc') AS has_column
+""")
+
+
+# Idempotent and safe to run concurrently: no check-then-ALTER race
+ADD_TOC_COLUMN_SQL = text("ALTER TABLE documents ADD COLUMN IF NOT EXISTS toc JSONB")
+
+# Databases created before toc was JSONB have a plain JSON column
+CONVERT_TOC_TO_JSONB_SQL = text("""
+DO $$
+BEGIN
+    IF (SELECT data_type FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'documents'
+          AND column_name = 'toc') = 'json' THEN
+        ALTER TABLE documents ALTER COLUMN toc TYPE JSONB USING toc::jsonb;
+    END IF;
+END
+$$
+""")
+
+
+def ensure_toc_column(conn):
+    """Add documents.toc as JSONB (converting an older JSON column); commits"""
+    conn.execute(ADD_TOC_COLUMN_SQL)
+    conn.execute(CONVERT_TOC_TO_JSONB_SQL)
+    conn.commit()
+
+
+def toc_column_state(conn):
+    """Return (documents table exists, toc column exists)"""
+    row = conn.execute(TOC_COLUMN_STATE_SQL).one()
+    return row.has_table, row.has_column
 
 
 def migrate_add_toc_column():
@@ -25,27 +61,23 @@ def migrate_add_toc_column():
     
     try:
         engine = create_engine(db_url, pool_pre_ping=True)
-        inspector = inspect(engine)
-        
-        # Check if documents table exists
-        if not inspector.has_table("documents"):
-            print("❌ Documents table does not exist. Please initialize the database first.")
-            return False
-        
-        # Check if toc column already exists
-        columns = [col['name'] for col in inspector.get_columns("documents")]
-        if 'toc' in columns:
-            print("✅ Column 'toc' already exists in documents table")
-            return True
         
-        # Add the toc column
-        print("🔄 Adding 'toc' column to documents table...")
         with engine.connect() as conn:
-            # PostgreSQL JSON column
-            conn.execute(text("ALTER TABLE documents ADD COLUMN toc JSON"))
-            conn.commit()
+            has_table, has_column = toc_column_state(conn)
+            
+            # Check if documents table exists
+            if not has_table:
+                print("❌ Documents table does not exist. Please initialize the database first.")
+                return False
+            
+            # Add the toc column (or convert an existing JSON one to JSONB)
+            print("🔄 Ensuring 'toc' JSONB column on documents table...")
+            ensure_toc_column(conn)
         
-        print("✅ Successfully added 'toc' column to documents table")
+        if has_column:
+            print("✅ Column 'toc' already exists in documents table (JSONB)")
+        else:
+            print("✅ Successfully added 'toc' column to documents table")
         return True
         
     except Exception as e:
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Migration script to move created_at defaults into PostgreSQL
+documents.created_at and chunks.created_at become TIMESTAMPTZ NOT NULL DEFAULT now(),
+so rows get their timestamp from the server instead of from Python
+"""
+import os
+import sys
+from sqlalchemy import create_engine, text, inspect
+
+# Add parent directory to path to import config
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD
+)
+
+TABLES = ("documents", "chunks")
+
+
+def _created_at_column(inspector, table: str):
+    return next(col for col in inspector.get_columns(table) if col['name'] == "created_at")
+
+
+def needs_created_at_default(engine) -> bool:
+    """Check whether any created_at column still lacks the server-side default"""
+    inspector = inspect(engine)
+    return any(_created_at_column(inspector, table)['default'] is None for table in TABLES)
+
+
+def set_created_at_default(engine) -> None:
+    """Convert created_at to TIMESTAMPTZ (values were naive UTC) with DEFAULT now() NOT NULL"""
+    inspector = inspect(engine)
+    with engine.connect() as conn:
+        for table in TABLES:
+            column = _created_at_column(inspector, table)
+            if not getattr(column['type'], 'timezone', False):
+                conn.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN created_at TYPE TIMESTAMPTZ "
+                    f"USING created_at AT TIME ZONE 'UTC'"
+                ))
+            conn.execute(text(f"UPDATE {table} SET created_at = now() WHERE created_at IS NULL"))
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT now()"))
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL"))
+        conn.commit()
+
+
+def migrate_created_at_default():
+    """Set server-side created_at defaults if they are missing"""
+    db_url = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    
+    try:
+        engine = create_engine(db_url, pool_pre_ping=True)
+        inspector = inspect(engine)
+        
+        # Check if both tables exist
+        if not all(inspector.has_table(table) for table in TABLES):
+            print("❌ Documents/chunks tables do not exist. Please initialize the database first.")
+            return False
+        
+        # Check if the defaults are already in place
+        if not needs_created_at_default(engine):
+            print("✅ created_at already defaults to now() in documents and chunks")
+            return True
+        
+        print("🔄 Setting server-side created_at defaults...")
+        set_created_at_default(engine)
+        
+        print("✅ Successfully set created_at to TIMESTAMPTZ NOT NULL DEFAULT now()")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error setting created_at defaults: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if 'engine' in locals():
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    print("🚀 Running migration: Server-side created_at defaults")
+    print("=" * 60)
+    success = migrate_created_at_default()
+    print("=" * 60)
+    if success:
+        print("✅ Migration completed successfully")
+        sys.exit(0)
+    else:
+        print("❌ Migration failed")
+        sys.exit(1)
@@ -3,9 +3,12 @@ Data classes for database operations
 These are used for data transfer and business logic, separate from SQLAlchemy ORM models
 """
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union, TYPE_CHECKING
 from datetime import datetime
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 @dataclass
 class DocumentData:
@@ -16,6 +19,7 @@ class DocumentData:
     file_hash: str
     created_at: Optional[datetime] = None
     chunk_count: int = 0
+    full_text_length: Optional[int] = None  # Stored length; measured from full_text if unset
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for API responses"""
@@ -25,7 +29,7 @@ class DocumentData:
             "chunk_count": self.chunk_count,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "file_hash": self.file_hash,
-            "full_text_length": len(self.full_text)
+            "full_text_length": self.full_text_length if self.full_text_length is not None else len(self.full_text)
         }
     
     @classmethod
@@ -37,7 +41,8 @@ class DocumentData:
             full_text=orm_doc.full_text,
             file_hash=orm_doc.file_hash,
             created_at=orm_doc.created_at,
-            chunk_count=orm_doc.chunk_count
+            chunk_count=orm_doc.chunk_count,
+            full_text_length=orm_doc.full_text_length
         )
 
 
@@ -49,6 +54,7 @@ class ChunkData:
     chunk_index: int
     text: str
     created_at: Optional[datetime] = None
+    milvus_id: Optional[int] = None  # int64 id of the chunk's vector in Milvus
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for API responses"""
@@ -58,7 +64,8 @@ class ChunkData:
             "chunk_index": self.chunk_index,
             "text": self.text,
             "created_at": self.created_at.isoformat() if self.created_at else None,
-            "text_length": len(self.text)
+            "text_length": len(self.text),
+            "milvus_id": self.milvus_id
         }
     
     @classmethod
@@ -69,15 +76,19 @@ class ChunkData:
             document_id=orm_chunk.document_id,
             chunk_index=orm_chunk.chunk_index,
             text=orm_chunk.text,
-            created_at=orm_chunk.created_at
+            created_at=orm_chunk.created_at,
+            milvus_id=orm_chunk.milvus_id
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class VectorData:
     """Data class for Milvus vector data"""
+    # One instance per chunk during ingestion/re-sync: no per-instance __dict__
+    __slots__ = ("id", "vector", "document_id", "chunk_index")
+    
     id: int  # int64 for Milvus
-    vector: List[float]
+    vector: Union[List[float], 'np.ndarray']  # float32 ndarray when built from an embedding
     document_id: str
     chunk_index: int
     
@@ -91,9 +102,12 @@ class VectorData:
         }
 
 
-@dataclass
+@dataclass(frozen=True)
 class SearchResult:
     """Data class for search results"""
+    # One instance per retrieved chunk on every query: no per-instance __dict__
+    __slots__ = ("id", "document_id", "chunk_index", "text", "distance", "score")
+    
     id: str  # PostgreSQL UUID string, not Milvus int64
     document_id: str
     chunk_index: int
@@ -200,14 +214,29 @@ class TOCItem:
     chunk_end: Optional[int] = None  # Ending chunk index
     children: List['TOCItem'] = field(default_factory=list)  # Nested items
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization and API responses"""
+    def _node_dict(self) -> Dict[str, Any]:
+        """This item's fields, with an empty children list for to_dict to fill"""
         return {
             "title": self.title,
             "level": self.level,
             "position": self.position,
             "chunk_start": self.chunk_start,
             "chunk_end": self.chunk_end,
-            "children": [child.to_dict() for child in self.children]
+            "children": []
         }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to dictionary for JSON serialization and API responses
+        Walks the tree with an explicit stack (no recursion, any depth)
+        """
+        root = self._node_dict()
+        stack = [(self, root["children"])]
+        while stack:
+            item, children_out = stack.pop()
+            for child in item.children:
+                child_dict = child._node_dict()
+                children_out.append(child_dict)
+                stack.append((child, child_dict["children"]))
+        return root
 
@@ -7,10 +7,13 @@ Exports synchronized data to CSV
 import os
 import sys
 import csv
+import heapq
+import io
+from collections import defaultdict
 from datetime import datetime
-from dotenv import load_dotenv
-from pymilvus import MilvusClient
-from sqlalchemy import create_engine
+from itertools import groupby
+from operator import itemgetter
+from sqlalchemy import create_engine, func, select
 from sqlalchemy.orm import sessionmaker
 
 # Add parent directory to path to import config
@@ -20,125 +23,165 @@ from config import (
     POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD,
     MILVUS_LITE_PATH, MILVUS_COLLECTION
 )
-from database.database_manager import Document, Chunk, DatabaseManager
+from database.database_manager import Document, Chunk, DatabaseManager, MILVUS_PATH
 from database import VerificationResult, DocumentListItem
 
-# Load environment variables
-load_dotenv()
+# CSV export write buffer (1 MiB): many rows per write() call instead of one per 8 KiB
+CSV_WRITE_BUFFER = 1 << 20
+# Encoded CSV is handed out by iter_csv_rows in blocks of about this size
+CSV_FLUSH_SIZE = 64 * 1024
+# PostgreSQL to_char() pattern for ISO 8601 timestamps (what datetime.isoformat()
+# gives for TIMESTAMPTZ values), so the export never formats dates in Python
+ISO_TIMESTAMP_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS.USTZH:TZM'
 
 
-def export_to_csv(db_manager, output_file="database_verification.csv"):
+def _iter_milvus_vectors(milvus_client, collection_name, batch_size=1000):
     """
-    Export all synchronized data from PostgreSQL and Milvus to CSV
-    Creates a synchronized view matching records by document_id and chunk_index
+    Yield every vector's metadata (id, document_id, chunk_index) from Milvus,
+    paging through the collection batch_size entities at a time
+    Note: Milvus only stores embeddings, not text. Text is in PostgreSQL.
     """
-    print(f"\n📊 Exporting synchronized data to {output_file}...")
+    iterator = milvus_client.query_iterator(
+        collection_name=collection_name,
+        batch_size=batch_size,
+        filter="",
+        output_fields=["id", "document_id", "chunk_index"]  # No text field
+    )
+    try:
+        while True:
+            batch = iterator.next()
+            if not batch:
+                break
+            yield from batch
+    finally:
+        iterator.close()
+
+
+def _merge_sync_keys(postgres_chunks, milvus_vector_ids):
+    """
+    Sorted merge of PostgreSQL chunk rows (ordered by document_id, chunk_index)
+    with the Milvus vector ids (keyed the same way)
+    Yields (key, chunk row or None, vector id or None) in key order, without
+    building a set of all keys
+    """
+    pg_stream = (((row.document_id, row.chunk_index), row, None) for row in postgres_chunks)
+    milvus_stream = ((key, None, vector_id) for key, vector_id in sorted(milvus_vector_ids.items()))
+    merged = heapq.merge(pg_stream, milvus_stream, key=itemgetter(0))
+    for key, entries in groupby(merged, key=itemgetter(0)):
+        postgres_chunk = milvus_vector_id = None
+        for _, row, vector_id in entries:
+            if row is not None:
+                postgres_chunk = row
+            if vector_id is not None:
+                milvus_vector_id = vector_id
+        yield key, postgres_chunk, milvus_vector_id
+
+
+# CSV Headers - synchronized view
+CSV_HEADERS = [
+    # Document info
+    'document_id',
+    'document_filename',
+    'document_created_at',
+    'document_file_hash',
+    'document_chunk_count',
+    'document_full_text_length',
+    # PostgreSQL Chunk info
+    'postgres_chunk_id',
+    'postgres_chunk_index',
+    'postgres_chunk_text',
+    'postgres_chunk_created_at',
+    'postgres_exists',
+    # Milvus Vector info (embeddings only, no text)
+    'milvus_vector_id',
+    'milvus_chunk_index',
+    'milvus_exists',
+    # Synchronization status
+    'synchronized',
+    'sync_notes'
+]
+
+
+def iter_csv_rows(db_manager, stats=None):
+    """
+    Yield the synchronized PostgreSQL/Milvus view as UTF-8 encoded CSV,
+    matching records by document_id and chunk_index
+    Rows are produced as PostgreSQL chunks stream in and handed out in blocks
+    of about CSV_FLUSH_SIZE bytes, so nothing is buffered
     
+    Args:
+        db_manager: Initialized DatabaseManager
+        stats: Optional dict, filled with the export counts once all rows are out
+    """
     db = db_manager.get_session()
-    csv_data = []
     
     try:
-        # Get all documents from PostgreSQL
-        documents = db.query(Document).order_by(Document.created_at).all()
-        
-        # Get all chunks from PostgreSQL
-        all_chunks = db.query(Chunk).order_by(Chunk.document_id, Chunk.chunk_index).all()
-        
-        # Create a mapping of chunk_id (string) to chunk data
-        postgres_chunks_map = {}
-        for chunk in all_chunks:
-            key = (chunk.document_id, chunk.chunk_index)
-            postgres_chunks_map[key] = {
-                'chunk_id': chunk.id,
-                'document_id': chunk.document_id,
-                'chunk_index': chunk.chunk_index,
-                'text': chunk.text,
-                'created_at': chunk.created_at.isoformat() if chunk.created_at else ''
-            }
-        
-        # Get document info mapping
-        documents_map = {doc.id: doc for doc in documents}
-        
-        # Get all vectors from Milvus
-        milvus_vectors_map = {}
+        # Get document info mapping (timestamps arrive already formatted)
+        documents_map = {
+            doc.id: doc for doc in db.query(
+                Document.id, Document.filename, Document.file_hash, Document.chunk_count,
+                Document.full_text_length,
+                func.to_char(Document.created_at, ISO_TIMESTAMP_FORMAT).label("created_at_iso")
+            )
+        }
+        
+        # Get all vector ids from Milvus, keyed by (document_id, chunk_index)
+        # Note: text is NOT in Milvus, only in PostgreSQL
+        milvus_vector_ids = {}
         if db_manager.milvus_client and db_manager.milvus_client.has_collection(db_manager.collection_name):
             try:
-                # Note: Milvus only stores embeddings, not text. Text is in PostgreSQL.
-                milvus_vectors = db_manager.milvus_client.query(
-                    collection_name=db_manager.collection_name,
-                    filter="",
-                    limit=10000,
-                    output_fields=["id", "document_id", "chunk_index"]  # No text field
-                )
-                
-                if milvus_vectors:
-                    for vector in milvus_vectors:
-                        if isinstance(vector, dict):
-                            doc_id = vector.get('document_id', '')
-                            chunk_idx = vector.get('chunk_index', -1)
-                            key = (doc_id, chunk_idx)
-                            milvus_vectors_map[key] = {
-                                'vector_id': vector.get('id', ''),
-                                'document_id': doc_id,
-                                'chunk_index': chunk_idx
-                                # Note: text is NOT in Milvus, only in PostgreSQL
-                            }
+                for vector in _iter_milvus_vectors(db_manager.milvus_client, db_manager.collection_name):
+                    key = (vector.get('document_id', ''), vector.get('chunk_index', -1))
+                    milvus_vector_ids[key] = vector.get('id', '')
             except Exception as e:
                 print(f"   ⚠️  Could not query Milvus vectors: {e}")
         
-        # Create synchronized records
-        # Get all unique keys from both databases
-        all_keys = set(postgres_chunks_map.keys()) | set(milvus_vectors_map.keys())
-        
-        # CSV Headers - synchronized view
-        headers = [
-            # Document info
-            'document_id',
-            'document_filename',
-            'document_created_at',
-            'document_file_hash',
-            'document_chunk_count',
-            'document_full_text_length',
-            # PostgreSQL Chunk info
-            'postgres_chunk_id',
-            'postgres_chunk_index',
-            'postgres_chunk_text',
-            'postgres_chunk_created_at',
-            'postgres_exists',
-            # Milvus Vector info (embeddings only, no text)
-            'milvus_vector_id',
-            'milvus_chunk_index',
-            'milvus_exists',
-            # Synchronization status
-            'synchronized',
-            'sync_notes'
-        ]
-        
-        # Create rows
-        for key in sorted(all_keys):
+        # Stream the chunk columns the CSV needs from PostgreSQL in key order
+        # (plain rows, no ORM objects; server-side cursor, 1000 rows at a time).
+        # "C" collation sorts like Python's str ordering, which the merge with
+        # the Milvus keys relies on
+        postgres_chunks = db.execute(
+            select(
+                Chunk.document_id, Chunk.chunk_index, Chunk.id, Chunk.text,
+                func.to_char(Chunk.created_at, ISO_TIMESTAMP_FORMAT).label("created_at_iso")
+            )
+            .order_by(Chunk.document_id.collate("C"), Chunk.chunk_index)
+            .execution_options(yield_per=1000)
+        )
+        
+        rows_written = 0
+        postgres_total = 0
+        synchronized_count = 0
+        missing_postgres = 0
+        missing_milvus = 0
+        
+        buffer = io.StringIO(newline='')
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_HEADERS)
+        writerow = writer.writerow
+        
+        # Create rows (the union of both databases, in key order)
+        for key, postgres_chunk, milvus_vector_id in _merge_sync_keys(postgres_chunks, milvus_vector_ids):
             doc_id, chunk_idx = key
             
             # Get document info
             doc = documents_map.get(doc_id, None)
             doc_filename = doc.filename if doc else 'N/A'
-            doc_created_at = doc.created_at.isoformat() if doc and doc.created_at else 'N/A'
+            doc_created_at = doc.created_at_iso if doc and doc.created_at_iso else 'N/A'
             doc_file_hash = doc.file_hash if doc else 'N/A'
             doc_chunk_count = doc.chunk_count if doc else 0
-            doc_text_length = len(doc.full_text) if doc and doc.full_text else 0
+            doc_text_length = (doc.full_text_length or 0) if doc else 0
             
             # Get PostgreSQL chunk data
-            postgres_chunk = postgres_chunks_map.get(key, None)
             postgres_exists = 'Yes' if postgres_chunk else 'No'
-            postgres_chunk_id = postgres_chunk['chunk_id'] if postgres_chunk else ''
-            postgres_chunk_index = postgres_chunk['chunk_index'] if postgres_chunk else chunk_idx
-            postgres_chunk_text = postgres_chunk['text'] if postgres_chunk else ''
-            postgres_chunk_created_at = postgres_chunk['created_at'] if postgres_chunk else ''
+            postgres_chunk_id = postgres_chunk.id if postgres_chunk else ''
+            postgres_chunk_index = postgres_chunk.chunk_index if postgres_chunk else chunk_idx
+            postgres_chunk_text = postgres_chunk.text if postgres_chunk else ''
+            postgres_chunk_created_at = postgres_chunk.created_at_iso if postgres_chunk and postgres_chunk.created_at_iso else ''
             
             # Get Milvus vector data (embeddings only, no text)
-            milvus_vector = milvus_vectors_map.get(key, None)
+            milvus_vector = milvus_vector_id is not None
             milvus_exists = 'Yes' if milvus_vector else 'No'
-            milvus_vector_id = str(milvus_vector['vector_id']) if milvus_vector else ''
-            milvus_chunk_index = milvus_vector['chunk_index'] if milvus_vector else chunk_idx
             # Note: text is NOT stored in Milvus, only embeddings
             
             # Check synchronization
@@ -146,15 +189,20 @@ def export_to_csv(db_manager, output_file="database_verification.csv"):
             sync_notes = ''
             if not postgres_chunk and milvus_vector:
                 sync_notes = 'Missing in PostgreSQL'
+                missing_postgres += 1
             elif postgres_chunk and not milvus_vector:
                 sync_notes = 'Missing in Milvus'
+                missing_milvus += 1
             elif postgres_chunk and milvus_vector:
                 # Both exist - synchronization OK
                 # Note: text is only in PostgreSQL, not in Milvus (which only has embeddings)
                 sync_notes = 'OK'
+                synchronized_count += 1
+            if postgres_chunk:
+                postgres_total += 1
             
-            # Create row
-            row = [
+            # Write row
+            writerow([
                 doc_id,
                 doc_filename,
                 doc_created_at,
@@ -166,27 +214,53 @@ def export_to_csv(db_manager, output_file="database_verification.csv"):
                 postgres_chunk_text,
                 postgres_chunk_created_at,
                 postgres_exists,
-                milvus_vector_id,
-                milvus_chunk_index,
+                str(milvus_vector_id) if milvus_vector else '',
+                chunk_idx,
                 milvus_exists,
                 synchronized,
                 sync_notes
-            ]
+            ])
+            rows_written += 1
             
-            csv_data.append(row)
-        
-        # Write to CSV
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(headers)
-            writer.writerows(csv_data)
-        
-        print(f"✅ Exported {len(csv_data)} synchronized records to {output_file}")
-        print(f"   PostgreSQL chunks: {len(postgres_chunks_map)}")
-        print(f"   Milvus vectors: {len(milvus_vectors_map)}")
-        print(f"   Synchronized records: {sum(1 for row in csv_data if row[headers.index('synchronized')] == 'Yes')}")
-        print(f"   Missing in PostgreSQL: {sum(1 for row in csv_data if 'Missing in PostgreSQL' in row[headers.index('sync_notes')])}")
-        print(f"   Missing in Milvus: {sum(1 for row in csv_data if 'Missing in Milvus' in row[headers.index('sync_notes')])}")
+            if buffer.tell() >= CSV_FLUSH_SIZE:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+        
+        yield buffer.getvalue().encode('utf-8')
+        
+        if stats is not None:
+            stats.update(
+                rows=rows_written,
+                postgres_chunks=postgres_total,
+                milvus_vectors=len(milvus_vector_ids),
+                synchronized=synchronized_count,
+                missing_postgres=missing_postgres,
+                missing_milvus=missing_milvus
+            )
+    finally:
+        db.close()
+
+
+def export_to_csv(db_manager, output_file="database_verification.csv"):
+    """
+    Export all synchronized data from PostgreSQL and Milvus to CSV
+    Creates a synchronized view matching records by document_id and chunk_index
+    """
+    print(f"\n📊 Exporting synchronized data to {output_file}...")
+    
+    try:
+        stats = {}
+        with open(output_file, 'wb', buffering=CSV_WRITE_BUFFER) as csvfile:
+            for data in iter_csv_rows(db_manager, stats):
+                csvfile.write(data)
+        
+        print(f"✅ Exported {stats['rows']} synchronized records to {output_file}")
+        print(f"   PostgreSQL chunks: {stats['postgres_chunks']}")
+        print(f"   Milvus vectors: {stats['milvus_vectors']}")
+        print(f"   Synchronized records: {stats['synchronized']}")
+        print(f"   Missing in PostgreSQL: {stats['missing_postgres']}")
+        print(f"   Missing in Milvus: {stats['missing_milvus']}")
         
         return output_file
         
@@ -195,51 +269,70 @@ def export_to_csv(db_manager, output_file="database_verification.csv"):
         import traceback
         traceback.print_exc()
         return None
-    finally:
-        db.close()
 
-def verify_postgres():
-    """Verify and display PostgreSQL database contents"""
+def verify_postgres(db_manager):
+    """Verify and display PostgreSQL database contents using an initialized DatabaseManager"""
     print("=" * 80)
     print("📊 PostgreSQL Database Verification")
     print("=" * 80)
     
     try:
-        # Use DatabaseManager for verification
-        db_manager = DatabaseManager()
-        db_manager._init_postgres()
         db = db_manager.get_session()
         
+        # Documents with their chunk counts and a 200-character text preview,
+        # in one round-trip (full_text itself is never loaded)
+        doc_rows = db.execute(
+            select(Document, func.count(Chunk.id).label("n_chunks"), func.left(Document.full_text, 200).label("preview"))
+            .outerjoin(Chunk, Chunk.document_id == Document.id)
+            .group_by(Document.id)
+            .order_by(Document.created_at.desc())
+        ).all()
+        
         # Count documents
-        doc_count = db.query(Document).count()
+        doc_count = len(doc_rows)
         print(f"\n📄 Documents: {doc_count}")
         
         if doc_count > 0:
             print("\n" + "-" * 80)
-            documents = db.query(Document).order_by(Document.created_at.desc()).all()
-            for doc in documents:
+            for doc, _, preview in doc_rows:
                 print(f"\n📄 Document ID: {doc.id}")
                 print(f"   Filename: {doc.filename}")
                 print(f"   Created: {doc.created_at}")
                 print(f"   Chunks: {doc.chunk_count}")
                 print(f"   File Hash: {doc.file_hash}")
-                print(f"   Text Preview: {doc.full_text[:200]}..." if len(doc.full_text) > 200 else f"   Text: {doc.full_text}")
+                print(f"   Text Preview: {preview}..." if (doc.full_text_length or 0) > 200 else f"   Text: {preview}")
             
             # Count chunks
-            chunk_count = db.query(Chunk).count()
+            chunk_count = sum(n_chunks for _, n_chunks, _ in doc_rows)
             print(f"\n\n📦 Total Chunks: {chunk_count}")
             
+            # First 3 chunks of every document (100-character previews) in one
+            # windowed query, so the remaining chunk texts are never fetched
+            ranked = select(
+                Chunk.document_id,
+                Chunk.chunk_index,
+                func.left(Chunk.text, 100).label("preview"),
+                (func.length(Chunk.text) > 100).label("truncated"),
+                func.row_number().over(partition_by=Chunk.document_id, order_by=Chunk.chunk_index).label("rn")
+            ).subquery()
+            chunk_previews = defaultdict(list)
+            for row in db.execute(
+                select(ranked.c.document_id, ranked.c.chunk_index, ranked.c.preview, ranked.c.truncated)
+                .where(ranked.c.rn <= 3)
+                .order_by(ranked.c.document_id, ranked.c.chunk_index)
+            ):
+                chunk_previews[row.document_id].append(row)
+            
             # Show chunk distribution by document
             print("\n" + "-" * 80)
             print("📦 Chunks by Document:")
-            for doc in documents:
-                chunks = db.query(Chunk).filter(Chunk.document_id == doc.id).order_by(Chunk.chunk_index).all()
-                print(f"\n   Document: {doc.filename} ({len(chunks)} chunks)")
-                for i, chunk in enumerate(chunks[:3]):  # Show first 3 chunks
-                    preview = chunk.text[:100] + "..." if len(chunk.text) > 100 else chunk.text
+            for doc, n_chunks, _ in doc_rows:
+                print(f"\n   Document: {doc.filename} ({n_chunks} chunks)")
+                for chunk in chunk_previews[doc.id]:  # Show first 3 chunks
+                    preview = chunk.preview + "..." if chunk.truncated else chunk.preview
                     print(f"      Chunk {chunk.chunk_index}: {preview}")
-                if len(chunks) > 3:
-                    print(f"      ... and {len(chunks) - 3} more chunks")
+                if n_chunks > 3:
+                    print(f"      ... and {n_chunks - 3} more chunks")
         else:
             print("\n   No documents found in PostgreSQL database.")
         
@@ -257,30 +350,21 @@ def verify_postgres():
         return False
 
 
-def verify_milvus():
-    """Verify and display Milvus Lite database contents"""
+def verify_milvus(db_manager):
+    """Verify and display Milvus Lite database contents using an initialized DatabaseManager"""
     print("\n" + "=" * 80)
     print("🔍 Milvus Lite Database Verification")
     print("=" * 80)
     
     try:
-        # Convert relative path to absolute path
-        milvus_path = os.path.abspath(MILVUS_LITE_PATH)
+        print(f"\n📁 Milvus Lite Path: {MILVUS_PATH}")
         
-        # Ensure the path ends with .db
-        if not milvus_path.endswith('.db'):
-            milvus_path = os.path.join(milvus_path, 'milvus_lite.db')
-        
-        print(f"\n📁 Milvus Lite Path: {milvus_path}")
-        
-        if not os.path.exists(milvus_path):
-            print(f"⚠️  Milvus Lite database file not found at: {milvus_path}")
-            print("   The database will be created when the first document is stored.")
+        # Reuse the manager's client instead of opening the file a second time
+        milvus_client = db_manager.milvus_client
+        if milvus_client is None:
+            print(f"⚠️  Milvus Lite is not connected (database file: {MILVUS_PATH})")
             return False
         
-        # Connect to Milvus Lite
-        milvus_client = MilvusClient(uri=milvus_path)
-        
         # Check if collection exists
         if not milvus_client.has_collection(MILVUS_COLLECTION):
             print(f"\n⚠️  Collection '{MILVUS_COLLECTION}' does not exist in Milvus Lite.")
@@ -297,91 +381,39 @@ def verify_milvus():
         
         # Count entities and get data
         try:
-            # Query all entities - Milvus Lite query method
-            # Try different query approaches based on pymilvus version
-            all_data = []
-            try:
-                # Method 1: Query with empty filter (newer API)
-                # Note: Milvus only stores embeddings, not text. Text is in PostgreSQL.
-                all_data = milvus_client.query(
-                    collection_name=MILVUS_COLLECTION,
-                    filter="",
-                    limit=10000,
-                    output_fields=["id", "document_id", "chunk_index"]  # No text field
-                )
-            except Exception as e1:
-                try:
-                    # Method 2: Query with expr parameter
-                    all_data = milvus_client.query(
-                        collection_name=MILVUS_COLLECTION,
-                        expr="id != ''",  # Expression that matches all
-                        limit=10000,
-                        output_fields=["id", "document_id", "chunk_index"]  # No text field
-                    )
-                except Exception as e2:
-                    try:
-                        # Method 3: Query without filter (may work in some versions)
-                        all_data = milvus_client.query(
-                            collection_name=MILVUS_COLLECTION,
-                            limit=10000,
-                            output_fields=["id", "document_id", "chunk_index"]  # No text field
-                        )
-                    except Exception as e3:
-                        # If all query methods fail, try to get collection stats
-                        print(f"   ⚠️  Could not query entities directly: {e3}")
-                        print("   Trying alternative method...")
-                        # We'll show what we can from collection info
-                        all_data = []
+            # Page through all entities, collecting the chunk indexes of each
+            # document as they arrive (MilvusClient always returns plain dicts)
+            doc_chunks = defaultdict(list)
+            entity_count = 0
+            sample = None
+            for item in _iter_milvus_vectors(milvus_client, MILVUS_COLLECTION):
+                if sample is None:
+                    sample = item
+                entity_count += 1
+                doc_chunks[item['document_id']].append(item['chunk_index'])
             
-            entity_count = len(all_data) if all_data else 0
             print(f"\n📦 Total Vectors: {entity_count}")
             
             if entity_count == 0:
                 print("\n   No vectors found in Milvus Lite collection.")
                 print("   This is normal if no documents have been uploaded yet.")
             elif entity_count > 0:
-                # Group by document_id
-                from collections import defaultdict
-                doc_chunks = defaultdict(list)
-                for item in all_data:
-                    # Handle both dict and object-like responses
-                    if isinstance(item, dict):
-                        doc_id = item.get('document_id', 'unknown')
-                        doc_chunks[doc_id].append(item)
-                    else:
-                        doc_id = getattr(item, 'document_id', 'unknown')
-                        doc_chunks[doc_id].append({
-                            'chunk_index': getattr(item, 'chunk_index', 'N/A')
-                            # Note: text is NOT in Milvus, only embeddings
-                        })
-                
                 print(f"\n📄 Vectors by Document:")
-                for doc_id, chunks in doc_chunks.items():
-                    print(f"\n   Document ID: {doc_id} ({len(chunks)} vectors)")
+                for doc_id, chunk_indexes in doc_chunks.items():
+                    print(f"\n   Document ID: {doc_id} ({len(chunk_indexes)} vectors)")
                     # Show first few chunks
-                    sorted_chunks = sorted(chunks, key=lambda x: x.get('chunk_index', 0) if isinstance(x, dict) else getattr(x, 'chunk_index', 0))
-                    for chunk in sorted_chunks[:3]:
-                        if isinstance(chunk, dict):
-                            chunk_idx = chunk.get('chunk_index', 'N/A')
-                        else:
-                            chunk_idx = getattr(chunk, 'chunk_index', 'N/A')
+                    for chunk_idx in heapq.nsmallest(3, chunk_indexes):
                         # Note: text is NOT in Milvus, only embeddings. Text is in PostgreSQL.
                         print(f"      Chunk {chunk_idx}: [Embedding only - text in PostgreSQL]")
-                    if len(chunks) > 3:
-                        print(f"      ... and {len(chunks) - 3} more vectors")
+                    if len(chunk_indexes) > 3:
+                        print(f"      ... and {len(chunk_indexes) - 3} more vectors")
                 
                 # Show sample vector info (vectors aren't returned in query, only metadata)
-                if all_data:
-                    sample = all_data[0]
+                if sample is not None:
                     print(f"\n📐 Sample Entity Info:")
-                    if isinstance(sample, dict):
-                        print(f"   Entity ID: {sample.get('id', 'N/A')}")
-                        print(f"   Document ID: {sample.get('document_id', 'N/A')}")
-                        print(f"   Chunk Index: {sample.get('chunk_index', 'N/A')}")
-                    else:
-                        print(f"   Entity ID: {getattr(sample, 'id', 'N/A')}")
-                        print(f"   Document ID: {getattr(sample, 'document_id', 'N/A')}")
-                        print(f"   Chunk Index: {getattr(sample, 'chunk_index', 'N/A')}")
+                    print(f"   Entity ID: {sample['id']}")
+                    print(f"   Document ID: {sample['document_id']}")
+                    print(f"   Chunk Index: {sample['chunk_index']}")
             else:
                 print("\n   No vectors found in Milvus Lite collection.")
         
@@ -460,8 +492,8 @@ def main():
         print("\n" + "=" * 80)
         print("📋 Detailed Verification")
         print("=" * 80)
-        postgres_ok = verify_postgres()
-        milvus_ok = verify_milvus()
+        postgres_ok = verify_postgres(db_manager)
+        milvus_ok = verify_milvus(db_manager)
     
     except Exception as e:
         print(f"   ⚠️  Could not perform verification: {e}")
@@ -7,6 +7,7 @@ and that all required methods are implemented correctly.
 import sys
 import os
 import inspect
+from functools import lru_cache
 from typing import get_type_hints, get_origin, get_args
 from dataclasses import fields
 
@@ -26,8 +27,9 @@ except ImportError as e:
     sys.exit(1)
 
 
+@lru_cache(maxsize=None)
 def get_orm_fields(orm_class):
-    """Extract field names and types from SQLAlchemy ORM model"""
+    """Extract field names and types from SQLAlchemy ORM model (cached per class, read-only)"""
     fields_dict = {}
     for column in orm_class.__table__.columns:
         fields_dict[column.name] = {
@@ -38,8 +40,9 @@ def get_orm_fields(orm_class):
     return fields_dict
 
 
+@lru_cache(maxsize=None)
 def get_dataclass_fields(dataclass_type):
-    """Extract field names and types from dataclass"""
+    """Extract field names and types from dataclass (cached per class, read-only)"""
     fields_dict = {}
     for field_obj in fields(dataclass_type):
         field_type = field_obj.type
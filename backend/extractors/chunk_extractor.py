@@ -3,7 +3,11 @@ Text Chunking Extractor
 Provides various chunking strategies for text processing
 """
 import re
-from typing import List, Optional, Dict, Tuple
+import sys
+from bisect import bisect_right
+from collections import defaultdict
+from functools import lru_cache
+from typing import Iterator, List, Optional, Dict, Tuple
 
 from config import (
     CHUNK_SIZE, CHUNK_OVERLAP, CHUNK_MIN_SIZE, EMBEDDING_MAX_LENGTH
@@ -16,6 +20,21 @@ except ImportError:
     extract_toc = None
     TOCItem = None
 
+# Sentence end used to split oversized paragraphs: punctuation plus the whitespace after it
+SENTENCE_END_RE = re.compile(r'[.!?](?:\s+|\n+)')
+
+
+def _iter_sentences(text: str) -> Iterator[str]:
+    """
+    Yield text cut after every sentence end (each piece keeps its separator)
+    The piece after the last sentence end is always yielded, even when empty
+    """
+    last = 0
+    for match in SENTENCE_END_RE.finditer(text):
+        yield text[last:match.end()]
+        last = match.end()
+    yield text[last:]
+
 
 class ChunkExtractor:
     """
@@ -23,6 +42,9 @@ class ChunkExtractor:
     Follows convention: PascalCase for class name
     """
     
+    # Sentence boundaries tried by chunk_text_simple, in order of preference
+    SENTENCE_BREAKS = ('. ', '.\n', '! ', '!\n', '? ', '?\n', '\n\n')
+    
     def __init__(
         self,
         chunk_size: Optional[int] = None,
@@ -67,6 +89,8 @@ class ChunkExtractor:
         
         chunks = []
         start = 0
+        # Breaks are only taken past the middle of the window, so only that half is searched
+        min_break = int(chunk_size * 0.5) + 1
         
         while start < len(text):
             end = start + chunk_size
@@ -75,9 +99,9 @@ class ChunkExtractor:
             # Try to break at sentence boundary if not at end
             if end < len(text):
                 # Look for sentence endings
-                for break_char in ['. ', '.\n', '! ', '!\n', '? ', '?\n', '\n\n']:
-                    last_break = chunk.rfind(break_char)
-                    if last_break > chunk_size * 0.5:  # Only break if we're past halfway
+                for break_char in self.SENTENCE_BREAKS:
+                    last_break = chunk.rfind(break_char, min_break)
+                    if last_break != -1:  # Only break if we're past halfway
                         chunk = chunk[:last_break + len(break_char)]
                         end = start + len(chunk)
                         break
@@ -94,6 +118,78 @@ class ChunkExtractor:
         
         return chunks
     
+    def _iter_section_chunks(
+        self,
+        text: str,
+        sections: List[Tuple[int, int, str, TOCItem]]
+    ) -> Iterator[Tuple[str, TOCItem, int]]:
+        """
+        Yield (chunk, item, chunk_index_in_item) for every TOC section, in order
+        Sections longer than the embedding limit are split at paragraph, then sentence, boundaries
+        
+        Args:
+            text: Document text content
+            sections: (start_pos, end_pos, title, item) tuples sorted by position
+        """
+        for item_start, item_end, _, item in sections:
+            item_text = text[item_start:item_end].strip()
+            
+            if not item_text:
+                continue
+            
+            # Each TOC item gets its own chunk(s) - never combine multiple TOC items
+            # If item fits within embedding limit, use as single chunk
+            if len(item_text) <= self.embedding_max_length:
+                yield item_text, item, 0  # First (and only) chunk of this item
+            else:
+                # Item is too long - split at paragraph boundaries
+                # Each resulting chunk will be part of the same TOC item
+                # Chunks are collected as lists of parts and joined once when finalized;
+                # current_len is the length the joined chunk will have
+                paragraphs = item_text.split('\n\n')
+                current_parts = []
+                current_len = 0
+                chunk_index_in_item = 0
+                
+                for para in paragraphs:
+                    para = para.strip()
+                    if not para:
+                        continue
+                    
+                    # If adding this paragraph would exceed limit, finalize current chunk
+                    if current_parts and current_len + len(para) + 2 > self.embedding_max_length:
+                        yield "\n\n".join(current_parts), item, chunk_index_in_item
+                        chunk_index_in_item += 1
+                        current_parts = [para]
+                        current_len = len(para)
+                    else:
+                        # Add paragraph to current chunk
+                        current_len += len(para) + 2 if current_parts else len(para)
+                        current_parts.append(para)
+                    
+                    # If single paragraph exceeds limit, split it at sentence boundaries
+                    if current_len > self.embedding_max_length:
+                        # Split the oversized paragraph
+                        temp_parts = []
+                        temp_len = 0
+                        
+                        for sentence in _iter_sentences("\n\n".join(current_parts)):
+                            if temp_len and temp_len + len(sentence) > self.embedding_max_length:
+                                yield "".join(temp_parts).strip(), item, chunk_index_in_item
+                                chunk_index_in_item += 1
+                                temp_parts = [sentence]
+                                temp_len = len(sentence)
+                            else:
+                                temp_parts.append(sentence)
+                                temp_len += len(sentence)
+                        
+                        current_parts = ["".join(temp_parts)] if temp_len else []
+                        current_len = temp_len
+                
+                # Add remaining chunk
+                if current_parts:
+                    yield "\n\n".join(current_parts), item, chunk_index_in_item
+    
     def chunk_text_toc_aware(
         self,
         text: str,
@@ -118,21 +214,27 @@ class ChunkExtractor:
         # Extract TOC first
         toc_data = None
         toc_items = None
+        all_toc_items_flat = []  # Every TOCItem in document order (parents before children)
         if extract_toc:
             try:
                 toc_items_dict = extract_toc(text, filename)
                 if toc_items_dict:
-                    # Convert dict to TOCItem objects for processing
-                    def dict_to_toc_item(d: Dict) -> TOCItem:
+                    # Convert dict to TOCItem objects for processing, collecting the
+                    # flat item list in the same pass
+                    # (explicit stack of (sibling list to fill, dict) - no recursion)
+                    roots, flat = [], []
+                    stack = [(roots, d) for d in reversed(toc_items_dict)]
+                    while stack:
+                        siblings, d = stack.pop()
                         item = TOCItem(
-                            title=d['title'],
+                            title=sys.intern(d['title']),  # Repeated titles ("Introduction", ...) share one string
                             level=d['level'],
                             position=d['position']
                         )
-                        item.children = [dict_to_toc_item(child) for child in d.get('children', [])]
-                        return item
-                    
-                    toc_items = [dict_to_toc_item(item) for item in toc_items_dict]
+                        siblings.append(item)
+                        flat.append(item)
+                        stack.extend((item.children, child) for child in reversed(d.get('children', [])))
+                    toc_items, all_toc_items_flat = roots, flat
                     toc_data = toc_items_dict
             except Exception as e:
                 print(f"⚠️  Failed to extract TOC for chunking: {e}")
@@ -144,134 +246,37 @@ class ChunkExtractor:
         
         # Flatten TOC to get all individual items (not sections) with their boundaries
         # This ensures each TOC item gets its own chunk(s)
-        def flatten_toc_items(
-            items: List[TOCItem],
-            all_items: List[Tuple[int, int, str, TOCItem]] = None
-        ) -> List[Tuple[int, int, str, TOCItem]]:
-            """Flatten TOC to get (start_pos, end_pos, title, item) tuples for each individual item"""
-            if all_items is None:
-                all_items = []
-            
-            # First, collect all items recursively (including children) to find boundaries
-            def collect_all_items(items_list: List[TOCItem], collected: List[TOCItem] = None) -> List[TOCItem]:
-                """Recursively collect all TOC items"""
-                if collected is None:
-                    collected = []
-                for item in items_list:
-                    collected.append(item)
-                    if item.children:
-                        collect_all_items(item.children, collected)
-                return collected
-            
-            all_toc_items_flat = collect_all_items(items)
+        def flatten_toc_items(all_toc_items_flat: List[TOCItem]) -> List[Tuple[int, int, str, TOCItem]]:
+            """
+            Turn the flat TOC item list into (start_pos, end_pos, title, item) tuples sorted by position
+            Each item ends where the next item at the same or higher level starts
+            """
+            all_toc_items_flat = sorted(all_toc_items_flat, key=lambda x: x.position)
+            positions = [item.position for item in all_toc_items_flat]
             
-            for item in items:
-                # Find end position (next sibling at same or higher level)
+            all_items = []
+            for item in all_toc_items_flat:
+                # Find end position (next item at same or higher level)
                 end_pos = len(text)  # Default to end of document
-                
-                # Find next item at same or higher level
-                for other_item in all_toc_items_flat:
-                    if other_item.position > item.position and other_item.level <= item.level:
-                        end_pos = min(end_pos, other_item.position)
-                
+                for i in range(bisect_right(positions, item.position), len(positions)):
+                    if all_toc_items_flat[i].level <= item.level:
+                        end_pos = positions[i]
+                        break
                 all_items.append((item.position, end_pos, item.title, item))
-                
-                # Process children recursively (they will have their own boundaries)
-                if item.children:
-                    flatten_toc_items(item.children, all_items)
             
             return all_items
         
-        # Get all individual TOC items (not sections)
-        all_toc_items = flatten_toc_items(toc_items)
-        
-        # Sort by position
-        all_toc_items.sort(key=lambda x: x[0])
-        
+        # Get all individual TOC items (not sections), sorted by position
         # Don't filter out items - each TOC item should get its own chunk
-        # Adjust end positions to next item start to avoid overlap
-        processed_items = []
-        for i, (start, end, title, item) in enumerate(all_toc_items):
-            # Adjust end position to next item start (at same or higher level)
-            actual_end = end
-            for other_start, _, _, other_item in all_toc_items:
-                # Only consider items at same or higher level
-                if other_start > start and other_item.level <= item.level:
-                    actual_end = min(actual_end, other_start)
-            
-            processed_items.append((start, actual_end, title, item))
-        
-        # Sort processed items by start position
-        processed_items.sort(key=lambda x: x[0])
+        processed_items = flatten_toc_items(all_toc_items_flat)
         
+        # Collect the chunks, grouping their indexes by TOC item as they are produced
+        # Lists are filled in emission order, so each is already ordered by chunk_index_in_item
         chunks = []
-        chunk_to_toc_map = []  # Track which TOC item each chunk belongs to (item_key, chunk_index_in_item)
-        # Structure: (item_key, chunk_index_in_item) where item_key is (position, title) and chunk_index_in_item is 0-based within that item
-        
-        for item_start, item_end, item_title, item in processed_items:
-            item_text = text[item_start:item_end].strip()
-            
-            if not item_text:
-                continue
-            
-            # Each TOC item gets its own chunk(s) - never combine multiple TOC items
-            # Create a unique key for this item (position, title)
-            item_key = (item_start, item_title)
-            
-            # If item fits within embedding limit, use as single chunk
-            if len(item_text) <= self.embedding_max_length:
-                chunks.append(item_text)
-                chunk_to_toc_map.append((item_key, 0))  # First (and only) chunk of this item
-            else:
-                # Item is too long - split at paragraph boundaries
-                # Each resulting chunk will be part of the same TOC item
-                paragraphs = item_text.split('\n\n')
-                current_chunk = ""
-                chunk_index_in_item = 0
-                
-                for para in paragraphs:
-                    para = para.strip()
-                    if not para:
-                        continue
-                    
-                    # If adding this paragraph would exceed limit, finalize current chunk
-                    if current_chunk and len(current_chunk) + len(para) + 2 > self.embedding_max_length:
-                        if current_chunk:
-                            chunks.append(current_chunk)
-                            chunk_to_toc_map.append((item_key, chunk_index_in_item))
-                            chunk_index_in_item += 1
-                        current_chunk = para
-                    else:
-                        # Add paragraph to current chunk
-                        if current_chunk:
-                            current_chunk += "\n\n" + para
-                        else:
-                            current_chunk = para
-                    
-                    # If single paragraph exceeds limit, split it at sentence boundaries
-                    if len(current_chunk) > self.embedding_max_length:
-                        # Split the oversized paragraph
-                        sentences = re.split(r'([.!?]\s+|[.!?]\n+)', current_chunk)
-                        temp_chunk = ""
-                        
-                        for i in range(0, len(sentences), 2):
-                            sentence = sentences[i] + (sentences[i+1] if i+1 < len(sentences) else "")
-                            
-                            if temp_chunk and len(temp_chunk) + len(sentence) > self.embedding_max_length:
-                                if temp_chunk:
-                                    chunks.append(temp_chunk.strip())
-                                    chunk_to_toc_map.append((item_key, chunk_index_in_item))
-                                    chunk_index_in_item += 1
-                                temp_chunk = sentence
-                            else:
-                                temp_chunk += sentence
-                        
-                        current_chunk = temp_chunk
-                
-                # Add remaining chunk
-                if current_chunk:
-                    chunks.append(current_chunk)
-                    chunk_to_toc_map.append((item_key, chunk_index_in_item))
+        item_chunks = defaultdict(list)  # id(item) -> list of (chunk_idx, chunk_index_in_item)
+        for chunk, item, chunk_index_in_item in self._iter_section_chunks(text, processed_items):
+            item_chunks[id(item)].append((len(chunks), chunk_index_in_item))
+            chunks.append(chunk)
         
         # If no chunks were created (no TOC sections), fall back to regular chunking
         if not chunks:
@@ -280,86 +285,56 @@ class ChunkExtractor:
         
         # Map TOC items to chunks - ensure 1 TOC item = 1 chunk (or multiple chunks for same item if too long)
         if toc_items and chunks:
-            # Create a mapping from item keys to TOC items
-            item_key_to_item = {}  # (position, title) -> TOCItem
-            def build_item_map(items: List[TOCItem]):
-                """Build mapping from item keys to TOC items"""
+            # Build the TOC dicts directly: one entry per chunk (or multiple for long items)
+            # No intermediate TOCItems; 'children' is only set for items that have some
+            # Walks the tree with a stack of (source items, dict list to fill)
+            toc_data = []
+            stack = [(toc_items, toc_data)]
+            while stack:
+                items, result = stack.pop()
                 for item in items:
-                    item_key_to_item[(item.position, item.title)] = item
-                    if item.children:
-                        build_item_map(item.children)
-            
-            build_item_map(toc_items)
-            
-            # Group chunks by TOC item key
-            item_chunks = {}  # item_key -> list of (chunk_idx, chunk_index_in_item)
-            for chunk_idx, (item_key, chunk_index_in_item) in enumerate(chunk_to_toc_map):
-                if item_key not in item_chunks:
-                    item_chunks[item_key] = []
-                item_chunks[item_key].append((chunk_idx, chunk_index_in_item))
-            
-            # Create new TOC items: one per chunk (or multiple for long items)
-            def process_toc_items(items: List[TOCItem]) -> List[TOCItem]:
-                """Process TOC items and create one TOC item per chunk"""
-                result = []
-                for item in items:
-                    item_key = (item.position, item.title)
+                    item_key = id(item)
                     if item_key in item_chunks:
-                        # This item has chunks - create one TOC item per chunk
-                        item_chunk_list = sorted(item_chunks[item_key], key=lambda x: x[1])
-                        
-                        for chunk_idx, chunk_index_in_item in item_chunk_list:
-                            # Create a new TOC item for this chunk
-                            chunk_toc_item = TOCItem(
-                                title=item.title if chunk_index_in_item == 0 else f"{item.title} (Part {chunk_index_in_item + 1})",
-                                level=item.level,
-                                position=item.position if chunk_index_in_item == 0 else None,
-                                chunk_start=chunk_idx,
-                                chunk_end=chunk_idx  # 1 chunk per TOC item
-                            )
+                        # This item has chunks - create one TOC entry per chunk
+                        for chunk_idx, chunk_index_in_item in item_chunks[item_key]:
+                            first_chunk = chunk_index_in_item == 0
+                            chunk_toc_item = {
+                                'title': item.title if first_chunk else f"{item.title} (Part {chunk_index_in_item + 1})",
+                                'level': item.level,
+                                'position': item.position if first_chunk else None,
+                                'chunk_start': chunk_idx,
+                                'chunk_end': chunk_idx  # 1 chunk per TOC item
+                            }
                             
                             # Process children if this is the first chunk
-                            if chunk_index_in_item == 0 and item.children:
-                                chunk_toc_item.children = process_toc_items(item.children)
+                            if first_chunk and item.children:
+                                chunk_toc_item['children'] = []
+                                stack.append((item.children, chunk_toc_item['children']))
                             
                             result.append(chunk_toc_item)
                     else:
                         # No chunks found for this item, keep original structure
-                        new_item = TOCItem(
-                            title=item.title,
-                            level=item.level,
-                            position=item.position,
-                            chunk_start=None,
-                            chunk_end=None
-                        )
+                        new_item = {
+                            'title': item.title,
+                            'level': item.level,
+                            'position': item.position,
+                            'chunk_start': None,
+                            'chunk_end': None
+                        }
                         if item.children:
-                            new_item.children = process_toc_items(item.children)
+                            new_item['children'] = []
+                            stack.append((item.children, new_item['children']))
                         result.append(new_item)
-                
-                return result
-            
-            # Process all TOC items
-            processed_toc_items = process_toc_items(toc_items)
-            
-            # Convert back to dict format
-            def toc_item_to_dict(item: TOCItem) -> Dict:
-                """Convert TOCItem to dict"""
-                result = {
-                    'title': item.title,
-                    'level': item.level,
-                    'position': item.position,
-                    'chunk_start': item.chunk_start,
-                    'chunk_end': item.chunk_end
-                }
-                if item.children:
-                    result['children'] = [toc_item_to_dict(child) for child in item.children]
-                return result
-            
-            toc_data = [toc_item_to_dict(item) for item in processed_toc_items]
         
         return chunks, toc_data
 
 
+@lru_cache(maxsize=1)
+def _default_extractor() -> ChunkExtractor:
+    """ChunkExtractor with config defaults, built once and shared (it holds no per-call state)"""
+    return ChunkExtractor()
+
+
 # Module-level convenience functions (following convention: snake_case)
 def chunk_text_simple(
     text: str,
@@ -377,8 +352,7 @@ def chunk_text_simple(
     Returns:
         List of text chunks
     """
-    extractor = ChunkExtractor()
-    return extractor.chunk_text_simple(text, chunk_size, chunk_overlap)
+    return _default_extractor().chunk_text_simple(text, chunk_size, chunk_overlap)
 
 
 def chunk_text_toc_aware(
@@ -395,6 +369,5 @@ def chunk_text_toc_aware(
     Returns:
         Tuple of (chunks: List[str], toc: Optional[List[Dict]])
     """
-    extractor = ChunkExtractor()
-    return extractor.chunk_text_toc_aware(text, filename)
+    return _default_extractor().chunk_text_toc_aware(text, filename)
 
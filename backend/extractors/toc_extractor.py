@@ -9,11 +9,50 @@ Follows convention rules:
 - Data classes are in database/models.py (TOCItem imported from there)
 """
 import re
+from itertools import accumulate
 from typing import List, Dict, Optional, Tuple
 
 # Import TOCItem from database/models.py (following convention: data classes in models.py)
 from database.models import TOCItem
 
+# Patterns are compiled once here and shared by all extractors
+# Markdown: "# Heading" and the "===" / "---" underline of setext headings
+MARKDOWN_HEADING_RE = re.compile(r'^(#{1,6})\s+(.+)$')
+MARKDOWN_UNDERLINE_RE = re.compile(r'^[=\-]{3,}$')
+# Python: class, def and async def lines (matched against the stripped line)
+PYTHON_CLASS_RE = re.compile(r'^class\s+(\w+)(?:\([^)]+\))?\s*:')
+PYTHON_DEF_RE = re.compile(r'^def\s+(\w+)\s*\([^)]*\)\s*:')
+PYTHON_ASYNC_DEF_RE = re.compile(r'^async\s+def\s+(\w+)\s*\([^)]*\)\s*:')
+# HTML: <h1>..</h6> headings, headings carrying an id, and tags inside them
+HTML_HEADING_RE = re.compile(r'<h([1-6])[^>]*>(.*?)</h[1-6]>', re.IGNORECASE | re.DOTALL)
+HTML_ID_HEADING_RE = re.compile(
+    r'<h([1-6])[^>]*id=["\']([^"\']+)["\'][^>]*>(.*?)</h[1-6]>',
+    re.IGNORECASE | re.DOTALL
+)
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+# Plain text: paragraph breaks, sentence ends, whitespace runs, numbered sections (1., 1.1, ...)
+PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n+')
+SENTENCE_END_RE = re.compile(r'[.!?]\s+')
+WHITESPACE_RE = re.compile(r'\s+')
+NUMBERED_SECTION_RE = re.compile(r'^\d+(\.\d+)*\.?\s+[A-Z]')
+NUMBERED_SECTION_PREFIX_RE = re.compile(r'^\d+(\.\d+)*\.?\s+')
+# Existing TOC sections: their heading ("# Contents", "Table of contents:", ...) and entries
+TOC_HEADING_RE = re.compile(
+    r'^(#+)?\s*(table\s+of\s+contents|contents|toc|index|overview)\s*:?\s*$',
+    re.IGNORECASE
+)
+TOC_NUMBERED_ENTRY_RE = re.compile(r'^\d+[\.\)]\s+')
+TOC_LIST_ENTRY_RE = re.compile(r'^[-*+]\s+')
+CAPITALIZED_WORD_RE = re.compile(r'^[A-Z][a-z]+')
+
+
+def _line_starts(lines: List[str]) -> List[int]:
+    """
+    Character offset at which each line starts, plus the total length at the end
+    line_starts[k] == sum(len(l) + 1 for l in lines[:k]), computed once instead of per heading
+    """
+    return list(accumulate((len(line) + 1 for line in lines), initial=0))
+
 
 def extract_toc_markdown(text: str) -> List[TOCItem]:
     """
@@ -28,15 +67,16 @@ def extract_toc_markdown(text: str) -> List[TOCItem]:
     """
     toc_items = []
     lines = text.split('\n')
+    line_starts = _line_starts(lines)
     
     for line_num, line in enumerate(lines):
         # Markdown heading: # Heading, ## Subheading, etc.
-        heading_match = re.match(r'^(#{1,6})\s+(.+)$', line.strip())
+        heading_match = MARKDOWN_HEADING_RE.match(line.strip())
         if heading_match:
             level = len(heading_match.group(1))
             title = heading_match.group(2).strip()
             # Calculate position (approximate)
-            position = sum(len(l) + 1 for l in lines[:line_num])
+            position = line_starts[line_num]
             toc_items.append(TOCItem(
                 title=title,
                 level=level,
@@ -45,10 +85,10 @@ def extract_toc_markdown(text: str) -> List[TOCItem]:
         # Alternative markdown heading (underlined)
         elif line_num > 0 and line.strip() and lines[line_num - 1].strip():
             # Check if current line is underline (=== or ---)
-            if re.match(r'^[=\-]{3,}$', line.strip()):
+            if MARKDOWN_UNDERLINE_RE.match(line.strip()):
                 title = lines[line_num - 1].strip()
                 level = 1 if line.strip().startswith('=') else 2
-                position = sum(len(l) + 1 for l in lines[:line_num - 1])
+                position = line_starts[line_num - 1]
                 # Avoid duplicates
                 if not any(item.title == title and item.position == position for item in toc_items):
                     toc_items.append(TOCItem(
@@ -73,6 +113,7 @@ def extract_toc_python(text: str) -> List[TOCItem]:
     """
     toc_items = []
     lines = text.split('\n')
+    line_starts = _line_starts(lines)
     
     for line_num, line in enumerate(lines):
         stripped = line.strip()
@@ -80,14 +121,14 @@ def extract_toc_python(text: str) -> List[TOCItem]:
             continue
         
         # Calculate position
-        position = sum(len(l) + 1 for l in lines[:line_num])
+        position = line_starts[line_num]
         
         # Check indentation to determine if it's a method (inside class) or function
         indent_level = len(line) - len(line.lstrip())
         is_method = indent_level > 0
         
         # Pattern 1: Class definition (level 1)
-        class_match = re.match(r'^class\s+(\w+)(?:\([^)]+\))?\s*:', stripped)
+        class_match = PYTHON_CLASS_RE.match(stripped)
         if class_match:
             class_name = class_match.group(1)
             toc_items.append(TOCItem(
@@ -98,7 +139,7 @@ def extract_toc_python(text: str) -> List[TOCItem]:
             continue  # Skip function matching for class definition line
         
         # Pattern 2: Function or method definition
-        func_match = re.match(r'^def\s+(\w+)\s*\([^)]*\)\s*:', stripped)
+        func_match = PYTHON_DEF_RE.match(stripped)
         if func_match:
             func_name = func_match.group(1)
             
@@ -120,7 +161,7 @@ def extract_toc_python(text: str) -> List[TOCItem]:
             continue
         
         # Pattern 3: Async function/method
-        async_func_match = re.match(r'^async\s+def\s+(\w+)\s*\([^)]*\)\s*:', stripped)
+        async_func_match = PYTHON_ASYNC_DEF_RE.match(stripped)
         if async_func_match:
             func_name = async_func_match.group(1)
             
@@ -154,7 +195,7 @@ def extract_toc_paragraphs(text: str) -> List[TOCItem]:
     toc_items = []
     
     # Split into paragraphs (double newline or significant spacing)
-    paragraphs = re.split(r'\n\s*\n+', text)
+    paragraphs = PARAGRAPH_BREAK_RE.split(text)
     
     cumulative_pos = 0
     for para_idx, paragraph in enumerate(paragraphs):
@@ -169,7 +210,7 @@ def extract_toc_paragraphs(text: str) -> List[TOCItem]:
         # Try to extract first sentence (up to 100 chars or until period)
         if len(first_line) > 100:
             # Find sentence boundary
-            sentence_end = re.search(r'[.!?]\s+', first_line[:100])
+            sentence_end = SENTENCE_END_RE.search(first_line[:100])
             if sentence_end:
                 title = first_line[:sentence_end.end()].strip()
             else:
@@ -178,7 +219,7 @@ def extract_toc_paragraphs(text: str) -> List[TOCItem]:
             title = first_line
         
         # Clean up title (remove extra whitespace, limit length)
-        title = re.sub(r'\s+', ' ', title).strip()
+        title = WHITESPACE_RE.sub(' ', title).strip()
         if len(title) > 150:
             title = title[:147] + "..."
         
@@ -207,19 +248,14 @@ def extract_toc_html(text: str) -> List[TOCItem]:
     """
     toc_items = []
     
-    # Pattern to match HTML heading tags: <h1>...</h1>, <h2>...</h2>, etc.
+    # Match HTML heading tags: <h1>...</h1>, <h2>...</h2>, etc.
     # Also handles self-closing or malformed tags
-    heading_pattern = re.compile(
-        r'<h([1-6])[^>]*>(.*?)</h[1-6]>',
-        re.IGNORECASE | re.DOTALL
-    )
-    
-    for match in heading_pattern.finditer(text):
+    for match in HTML_HEADING_RE.finditer(text):
         level = int(match.group(1))
         content = match.group(2)
         
         # Extract text content, removing nested HTML tags
-        text_content = re.sub(r'<[^>]+>', '', content).strip()
+        text_content = HTML_TAG_RE.sub('', content).strip()
         
         # Decode HTML entities (basic)
         text_content = text_content.replace('&nbsp;', ' ')
@@ -227,7 +263,7 @@ def extract_toc_html(text: str) -> List[TOCItem]:
         text_content = text_content.replace('&lt;', '<')
         text_content = text_content.replace('&gt;', '>')
         text_content = text_content.replace('&quot;', '"')
-        text_content = re.sub(r'\s+', ' ', text_content).strip()
+        text_content = WHITESPACE_RE.sub(' ', text_content).strip()
         
         if text_content:
             toc_items.append(TOCItem(
@@ -237,20 +273,15 @@ def extract_toc_html(text: str) -> List[TOCItem]:
             ))
     
     # Also check for alternative heading patterns (id attributes, etc.)
-    # Pattern for headings with IDs that might be used as anchors
-    id_heading_pattern = re.compile(
-        r'<h([1-6])[^>]*id=["\']([^"\']+)["\'][^>]*>(.*?)</h[1-6]>',
-        re.IGNORECASE | re.DOTALL
-    )
-    
-    for match in id_heading_pattern.finditer(text):
+    # Headings with IDs that might be used as anchors
+    for match in HTML_ID_HEADING_RE.finditer(text):
         level = int(match.group(1))
         heading_id = match.group(2)
         content = match.group(3)
         
         # Extract text content
-        text_content = re.sub(r'<[^>]+>', '', content).strip()
-        text_content = re.sub(r'\s+', ' ', text_content).strip()
+        text_content = HTML_TAG_RE.sub('', content).strip()
+        text_content = WHITESPACE_RE.sub(' ', text_content).strip()
         
         if text_content:
             # Check if we already have this heading (avoid duplicates)
@@ -278,6 +309,7 @@ def extract_toc_text(text: str) -> List[TOCItem]:
     """
     toc_items = []
     lines = text.split('\n')
+    line_starts = _line_starts(lines)
     
     for line_num, line in enumerate(lines):
         stripped = line.strip()
@@ -286,17 +318,17 @@ def extract_toc_text(text: str) -> List[TOCItem]:
         
         # Pattern 1: All caps line (likely heading)
         if stripped.isupper() and len(stripped) > 3 and len(stripped) < 100:
-            position = sum(len(l) + 1 for l in lines[:line_num])
+            position = line_starts[line_num]
             toc_items.append(TOCItem(
                 title=stripped,
                 level=1,
                 position=position
             ))
         # Pattern 2: Numbered sections (1., 1.1, 1.1.1, etc.)
-        elif re.match(r'^\d+(\.\d+)*\.?\s+[A-Z]', stripped):
+        elif NUMBERED_SECTION_RE.match(stripped):
             level = stripped.count('.') + 1
-            title = re.sub(r'^\d+(\.\d+)*\.?\s+', '', stripped)
-            position = sum(len(l) + 1 for l in lines[:line_num])
+            title = NUMBERED_SECTION_PREFIX_RE.sub('', stripped)
+            position = line_starts[line_num]
             toc_items.append(TOCItem(
                 title=title,
                 level=min(level, 3),  # Cap at level 3
@@ -306,7 +338,7 @@ def extract_toc_text(text: str) -> List[TOCItem]:
         elif stripped.endswith(':') and len(stripped) < 80 and line_num < len(lines) - 1:
             # Check if next line is not empty (likely a section header)
             if line_num + 1 < len(lines) and lines[line_num + 1].strip():
-                position = sum(len(l) + 1 for l in lines[:line_num])
+                position = line_starts[line_num]
                 toc_items.append(TOCItem(
                     title=stripped.rstrip(':'),
                     level=2,
@@ -454,14 +486,7 @@ def detect_toc_sections(text: str) -> List[Tuple[int, int]]:
     """
     toc_sections = []
     lines = text.split('\n')
-    
-    # Common TOC heading patterns (case-insensitive)
-    toc_heading_patterns = [
-        r'^#+\s*(table\s+of\s+contents|contents|toc|index|overview)\s*$',
-        r'^#+\s*(table\s+of\s+contents|contents|toc|index|overview)\s*:?\s*$',
-        r'^\s*(table\s+of\s+contents|contents|toc|index|overview)\s*$',
-        r'^\s*(table\s+of\s+contents|contents|toc|index|overview)\s*:?\s*$',
-    ]
+    line_starts = _line_starts(lines)
     
     # Common TOC indicators
     toc_indicators = [
@@ -478,11 +503,7 @@ def detect_toc_sections(text: str) -> List[Tuple[int, int]]:
         line_lower = line.lower()
         
         # Check if this line matches a TOC heading pattern
-        is_toc_heading = False
-        for pattern in toc_heading_patterns:
-            if re.match(pattern, line, re.IGNORECASE):
-                is_toc_heading = True
-                break
+        is_toc_heading = TOC_HEADING_RE.match(line) is not None
         
         # Also check if line contains TOC indicators (as standalone or in heading)
         if not is_toc_heading:
@@ -499,7 +520,7 @@ def detect_toc_sections(text: str) -> List[Tuple[int, int]]:
         
         if is_toc_heading:
             # Found a TOC heading - find where the TOC section ends
-            toc_start = sum(len(l) + 1 for l in lines[:i])
+            toc_start = line_starts[i]
             toc_end = toc_start
             
             # Look ahead to find the end of TOC section
@@ -518,7 +539,7 @@ def detect_toc_sections(text: str) -> List[Tuple[int, int]]:
                 next_line = lines[j].strip()
                 
                 # Check if we hit a major heading (likely end of TOC)
-                heading_match = re.match(r'^(#{1,6})\s+(.+)$', next_line)
+                heading_match = MARKDOWN_HEADING_RE.match(next_line)
                 if heading_match:
                     heading_level = len(heading_match.group(1))
                     heading_text = heading_match.group(2).strip()
@@ -530,8 +551,8 @@ def detect_toc_sections(text: str) -> List[Tuple[int, int]]:
                             check_line = lines[k].strip()
                             if check_line and len(check_line) > 50:
                                 # Make sure it's not a TOC entry
-                                if not (re.match(r'^\d+[\.\)]\s+', check_line) or
-                                        re.match(r'^[-*+]\s+', check_line) or
+                                if not (TOC_NUMBERED_ENTRY_RE.match(check_line) or
+                                        TOC_LIST_ENTRY_RE.match(check_line) or
                                         ('[' in check_line and ']' in check_line)):
                                     has_content = True
                                     break
@@ -545,8 +566,8 @@ def detect_toc_sections(text: str) -> List[Tuple[int, int]]:
                         following_line = lines[j + 1].strip()
                         if following_line and len(following_line) > 50:
                             # Check if it's not a TOC entry (numbered, list item, etc.)
-                            if not (re.match(r'^\d+[\.\)]\s+', following_line) or
-                                    re.match(r'^[-*+]\s+', following_line) or
+                            if not (TOC_NUMBERED_ENTRY_RE.match(following_line) or
+                                    TOC_LIST_ENTRY_RE.match(following_line) or
                                     ('[' in following_line and ']' in following_line)):
                                 # Likely end of TOC, start of content
                                 break
@@ -558,10 +579,10 @@ def detect_toc_sections(text: str) -> List[Tuple[int, int]]:
                     # TOC entries are typically short lines with links or numbers
                     is_toc_entry = (
                         (len(next_line) < 100 and 
-                         (re.match(r'^\d+[\.\)]\s+', next_line) or  # Numbered
+                         (TOC_NUMBERED_ENTRY_RE.match(next_line) or  # Numbered
                           '[' in next_line and ']' in next_line or  # Markdown links
-                          re.match(r'^[-*+]\s+', next_line))) or  # List items
-                        (len(next_line) < 80 and re.match(r'^[A-Z][a-z]+', next_line))  # Short capitalized lines
+                          TOC_LIST_ENTRY_RE.match(next_line))) or  # List items
+                        (len(next_line) < 80 and CAPITALIZED_WORD_RE.match(next_line))  # Short capitalized lines
                     )
                     
                     if is_toc_entry:
@@ -583,7 +604,7 @@ def detect_toc_sections(text: str) -> List[Tuple[int, int]]:
                 j += 1
             
             # Calculate end position
-            toc_end = sum(len(l) + 1 for l in lines[:j])
+            toc_end = line_starts[j]
             
             # Only add if TOC section is reasonable size (not entire document)
             # and has some content (at least 20 chars)
@@ -8,9 +8,10 @@ import atexit
 from contextlib import asynccontextmanager
 from typing import List, Optional, Dict
 from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from dotenv import load_dotenv
 from openai import OpenAI, AzureOpenAI
 from rag_system import RAGSystem
 from session_manager import SessionManager
@@ -20,9 +21,6 @@ from config import (
     LLM_TIMEOUT, SESSIONS_DIR, BACKUP_DIR, BACKUP_ON_SHUTDOWN, RESTORE_ON_START
 )
 
-# Load environment variables
-load_dotenv()
-
 # Global variables for shutdown backup
 backup_manager_global = None
 rag_system_global = None
@@ -61,7 +59,9 @@ async def lifespan(app: FastAPI):
     # Shutdown
     perform_shutdown_backup()
 
-app = FastAPI(title="Chatbox API", version="1.0.0", lifespan=lifespan)
+# JSON responses are rendered with orjson (much faster than json.dumps for
+# large payloads such as document lists and chat history)
+app = FastAPI(title="Chatbox API", version="1.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS middleware to allow React frontend to connect
 app.add_middleware(
@@ -329,7 +329,11 @@ async def list_documents():
     
     db: Session = rag_system.db_manager.get_session()
     try:
-        documents = db.query(Document).order_by(Document.created_at.desc()).all()
+        # Only the listed columns are loaded, as plain rows (no ORM instances);
+        # DocumentListItem.from_orm reads them by attribute either way
+        documents = db.query(
+            Document.id, Document.filename, Document.chunk_count, Document.created_at
+        ).order_by(Document.created_at.desc()).all()
         return {
             "documents": [
                 DocumentListItem.from_orm(doc).to_dict()
@@ -389,7 +393,9 @@ async def get_documents_batch(request: DocumentBatchRequest):
     
     db = rag_system.db_manager.get_session()
     try:
-        documents = db.query(Document).filter(Document.id.in_(request.document_ids)).all()
+        documents = db.query(
+            Document.id, Document.filename, Document.chunk_count, Document.created_at
+        ).filter(Document.id.in_(request.document_ids)).all()
         
         return {
             "status": "ok",
@@ -497,14 +503,17 @@ async def search_documents(query: str = "", limit: int = 5):
         total_docs = db.query(Document).count()
         print(f"📊 Total documents in database: {total_docs}")
         
+        # Only the columns DocumentListItem needs, as plain rows
+        list_query = db.query(Document.id, Document.filename, Document.chunk_count, Document.created_at)
+        
         if not query or len(query.strip()) == 0:
             # If no query, return most recent documents
-            documents = db.query(Document).order_by(Document.created_at.desc()).limit(limit).all()
+            documents = list_query.order_by(Document.created_at.desc()).limit(limit).all()
             print(f"📄 Returning {len(documents)} most recent documents (no query)")
         else:
             # Case-insensitive partial match on filename
             search_pattern = f"%{query.strip()}%"
-            documents = db.query(Document).filter(
+            documents = list_query.filter(
                 func.lower(Document.filename).like(func.lower(search_pattern))
             ).order_by(Document.created_at.desc()).limit(limit).all()
             print(f"🔍 Search for '{query}': found {len(documents)} documents")
@@ -537,6 +546,12 @@ async def delete_document(document_id: str):
     if not rag_system:
         raise HTTPException(status_code=400, detail="RAG system is not enabled")
     
+    # Document ids are UUIDs; anything else is rejected before it reaches a database filter
+    try:
+        document_id = str(uuid.UUID(document_id))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid document ID")
+    
     try:
         rag_system.delete_document(document_id)
         return {"status": "ok", "message": f"Document {document_id} deleted"}
@@ -572,6 +587,24 @@ async def check_synchronization():
         raise HTTPException(status_code=500, detail=f"Error checking synchronization: {str(e)}")
 
 
+@app.get("/api/documents/sync/export")
+async def export_synchronization_csv():
+    """
+    Stream the synchronized PostgreSQL/Milvus view as CSV (RAG system only)
+    Same rows as `verify_databases.py --output`, sent as they are produced
+    """
+    if not rag_system:
+        raise HTTPException(status_code=400, detail="RAG system is not enabled")
+    
+    from database.verify_databases import iter_csv_rows
+    
+    return StreamingResponse(
+        iter_csv_rows(rag_system.db_manager),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=database_verification.csv"}
+    )
+
+
 @app.post("/api/documents/resync")
 async def resync_databases():
     """Resynchronize databases by ensuring all PostgreSQL chunks exist in Milvus (RAG system only)"""
@@ -1162,6 +1195,9 @@ class RestoreRequest(BaseModel):
     backup_timestamp: str
     drop_existing: bool = False
 
+# Backup/restore shell out to pg_dump/pg_restore and can take minutes; they run
+# in the threadpool so the event loop keeps serving other requests meanwhile
+
 @app.post("/api/backup")
 async def create_backup(request: BackupRequest = BackupRequest()):
     """Create a backup of both PostgreSQL and Milvus databases"""
@@ -1169,7 +1205,7 @@ async def create_backup(request: BackupRequest = BackupRequest()):
         raise HTTPException(status_code=400, detail="RAG system is not enabled")
     
     try:
-        result = backup_manager.backup_all(backup_name=request.backup_name)
+        result = await run_in_threadpool(backup_manager.backup_all, backup_name=request.backup_name)
         return {
             "status": "ok" if result["success"] else "partial",
             "backup": result
@@ -1184,7 +1220,9 @@ async def create_postgres_backup(request: BackupRequest = BackupRequest()):
         raise HTTPException(status_code=400, detail="RAG system is not enabled")
     
     try:
-        success, path_or_error = backup_manager.backup_postgres(backup_name=request.backup_name)
+        success, path_or_error = await run_in_threadpool(
+            backup_manager.backup_postgres, backup_name=request.backup_name
+        )
         if success:
             return {
                 "status": "ok",
@@ -1204,7 +1242,9 @@ async def create_milvus_backup(request: BackupRequest = BackupRequest()):
         raise HTTPException(status_code=400, detail="RAG system is not enabled")
     
     try:
-        success, path_or_error = backup_manager.backup_milvus(backup_name=request.backup_name)
+        success, path_or_error = await run_in_threadpool(
+            backup_manager.backup_milvus, backup_name=request.backup_name
+        )
         if success:
             return {
                 "status": "ok",
@@ -1224,7 +1264,8 @@ async def restore_backup(request: RestoreRequest):
         raise HTTPException(status_code=400, detail="RAG system is not enabled")
     
     try:
-        result = backup_manager.restore_all(
+        result = await run_in_threadpool(
+            backup_manager.restore_all,
             backup_timestamp=request.backup_timestamp,
             drop_existing=request.drop_existing
         )
@@ -1256,7 +1297,8 @@ async def restore_postgres_backup(request: RestoreRequest):
                 detail=f"No PostgreSQL backup found with timestamp: {request.backup_timestamp}"
             )
         
-        success, message = backup_manager.restore_postgres(
+        success, message = await run_in_threadpool(
+            backup_manager.restore_postgres,
             backup_name=pg_backup,
             drop_existing=request.drop_existing
         )
@@ -1291,7 +1333,9 @@ async def restore_milvus_backup(request: RestoreRequest):
                 detail=f"No Milvus backup found with timestamp: {request.backup_timestamp}"
             )
         
-        success, message = backup_manager.restore_milvus(backup_name=milvus_backup)
+        success, message = await run_in_threadpool(
+            backup_manager.restore_milvus, backup_name=milvus_backup
+        )
         
         if success:
             return {"status": "ok", "message": message}
@@ -1320,5 +1364,8 @@ async def list_backups():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    from config import get_config
+    # Config is fully built here, before uvicorn starts any workers
+    config = get_config()
+    uvicorn.run(app, host=config.SERVER_HOST, port=config.SERVER_PORT)
 
@@ -6,6 +6,8 @@ Database operations are handled by DatabaseManager
 import uuid
 import hashlib
 from typing import List, Optional, Dict, Tuple
+import numpy as np
+from sqlalchemy.orm import defer
 from database import (
     DatabaseManager, Document, Chunk,
     DocumentData, ChunkData, VectorData, SearchResult,
@@ -173,7 +175,9 @@ class RAGSystem:
                     id=chunk_id,
                     document_id=doc_id,
                     chunk_index=idx,
-                    text=chunk_text
+                    text=chunk_text,
+                    # Milvus id computed once here and stored alongside the chunk
+                    milvus_id=self.db_manager._uuid_to_int64(chunk_id)
                 )
                 chunk_records.append(chunk_record)
                 db.add(chunk_record)
@@ -190,14 +194,13 @@ class RAGSystem:
                 progress = ((idx + 1) / total_chunks) * 100
                 print(f"   Generating embedding {idx + 1}/{total_chunks} ({progress:.1f}%)", end='\r')
                 
-                embedding = self.generate_embedding(chunk_text)
-                chunk_id_str = chunk_records[idx].id
-                # Convert UUID string to int64 for Milvus
-                chunk_id_int = self.db_manager._uuid_to_int64(chunk_id_str)
+                # Held until the batch insert: a float32 array is ~4 bytes per
+                # dimension instead of a list of boxed Python floats
+                embedding = np.asarray(self.generate_embedding(chunk_text), dtype=np.float32)
                 
                 # Create VectorData object
                 vector_data = VectorData(
-                    id=chunk_id_int,  # Milvus requires int64
+                    id=chunk_records[idx].milvus_id,  # Milvus requires int64
                     vector=embedding,  # Only embedding stored in Milvus
                     document_id=doc_id,  # Keep document_id for reference
                     chunk_index=idx  # Keep chunk_index for reference
@@ -250,8 +253,9 @@ class RAGSystem:
                 if document_ids and len(document_ids) > 0:
                     print(f"📌 Filtering by {len(document_ids)} documents - querying PostgreSQL first")
                     
-                    # Get all chunks from mentioned documents
-                    chunks_from_docs = db.query(Chunk).filter(
+                    # Get all chunks from mentioned documents (ids only: text is
+                    # fetched below for the chunks Milvus actually returns)
+                    chunks_from_docs = db.query(Chunk).options(defer(Chunk.text)).filter(
                         Chunk.document_id.in_(document_ids)
                     ).all()
                     
@@ -265,7 +269,9 @@ class RAGSystem:
                     chunk_uuid_to_int64 = {}
                     milvus_ids = []
                     for chunk in chunks_from_docs:
-                        milvus_id = DatabaseManager._uuid_to_int64(chunk.id)
+                        milvus_id = chunk.milvus_id
+                        if milvus_id is None:  # Chunk stored before milvus_id existed
+                            milvus_id = DatabaseManager._uuid_to_int64(chunk.id)
                         chunk_uuid_to_int64[milvus_id] = chunk.id
                         milvus_ids.append(milvus_id)
                     
@@ -488,8 +494,7 @@ class RAGSystem:
         """Retrieve full document text from PostgreSQL"""
         db = self.db_manager.get_session()
         try:
-            document = db.query(Document).filter(Document.id == document_id).first()
-            return document.full_text if document else None
+            return db.query(Document.full_text).filter(Document.id == document_id).scalar()
         finally:
             db.close()
     
@@ -524,11 +529,12 @@ class RAGSystem:
             
             # Get all documents and chunks from PostgreSQL
             documents = db.query(Document).all()
-            all_chunks = db.query(Chunk).all()
+            # Chunk text is only loaded for chunks that need a new embedding
+            all_chunks = db.query(Chunk).options(defer(Chunk.text)).all()
             
             # Get existing vectors from Milvus
             existing_vector_ids = set()
-            if self.db_manager.milvus_client.has_collection(self.db_manager.collection_name):
+            if self.db_manager.collection_ready:
                 try:
                     existing_vectors = self.db_manager.milvus_client.query(
                         collection_name=self.db_manager.collection_name,
@@ -547,12 +553,14 @@ class RAGSystem:
                 chunks_to_insert: List[VectorData] = []
                 
                 for chunk in doc_chunks:
-                    chunk_id_int = self.db_manager._uuid_to_int64(chunk.id)
+                    chunk_id_int = chunk.milvus_id
+                    if chunk_id_int is None:  # Chunk stored before milvus_id existed
+                        chunk_id_int = self.db_manager._uuid_to_int64(chunk.id)
                     
                     # Check if vector already exists in Milvus
                     if chunk_id_int not in existing_vector_ids:
                         # Generate embedding and prepare for insertion
-                        embedding = self.generate_embedding(chunk.text)
+                        embedding = np.asarray(self.generate_embedding(chunk.text), dtype=np.float32)
                         vector_data = VectorData(
                             id=chunk_id_int,
                             vector=embedding,  # Only embedding stored in Milvus
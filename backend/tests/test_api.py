@@ -224,8 +224,19 @@ class TestDocumentsEndpoints:
     def test_delete_nonexistent_document(self, client):
         """Test deleting a non-existent document"""
         response = client.delete("/api/documents/non-existent-id")
-        # Should either succeed (idempotent) or return error
-        assert response.status_code in [status.HTTP_200_OK, status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR]
+        # Should either succeed (idempotent) or return error (400 for ids that are not UUIDs)
+        assert response.status_code in [status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST, status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR]
+    
+    def test_delete_document_rejects_invalid_id(self, client_with_rag, sample_text):
+        """Test that a non-UUID id is rejected instead of reaching the Milvus filter"""
+        rag_system = client_with_rag.app.state.rag_system
+        doc_id = rag_system.store_document("test.txt", sample_text)
+        
+        response = client_with_rag.delete('/api/documents/nope" or document_id != "')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        
+        # Nothing was deleted
+        assert rag_system.get_document_text(doc_id) == sample_text
     
     def test_clean_all_documents(self, client):
         """Test cleaning all documents"""
@@ -254,6 +265,16 @@ class TestSynchronizationEndpoints:
         data = response.json()
         assert "success" in data or "message" in data
     
+    def test_export_synchronization_csv(self, client):
+        """Test streaming the synchronization CSV export"""
+        response = client.get("/api/documents/sync/export")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "attachment" in response.headers["content-disposition"]
+        header = response.text.splitlines()[0]
+        assert header.startswith("document_id,document_filename")
+        assert header.endswith("synchronized,sync_notes")
+    
     def test_sync_endpoints_rag_disabled(self, client):
         """Test sync endpoints when RAG is disabled"""
         with patch('main.rag_system', None):
@@ -264,6 +285,10 @@ class TestSynchronizationEndpoints:
             # Test resync
             response = client.post("/api/documents/resync")
             assert response.status_code == status.HTTP_400_BAD_REQUEST
+            
+            # Test CSV export
+            response = client.get("/api/documents/sync/export")
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
 @pytest.mark.api
@@ -0,0 +1,37 @@
+"""
+Tests for configuration loading (.env parsing)
+"""
+import pytest
+from config import _parse_env_file
+
+
+@pytest.mark.unit
+class TestEnvFileParsing:
+    """Tests for _parse_env_file"""
+    
+    def _parse(self, tmp_path, content):
+        env_file = tmp_path / ".env"
+        env_file.write_text(content, encoding="utf-8")
+        return _parse_env_file(str(env_file))
+    
+    def test_quoted_value_with_inline_comment(self, tmp_path):
+        """Test that quotes are stripped before an inline comment is dropped"""
+        parsed = self._parse(tmp_path, (
+            'DOUBLE="quoted value" # note\n'
+            "SINGLE='quoted # value'  # note\n"
+            "PLAIN=plain value # note\n"
+        ))
+        
+        assert parsed["DOUBLE"] == "quoted value"
+        assert parsed["SINGLE"] == "quoted # value"
+        assert parsed["PLAIN"] == "plain value"
+    
+    def test_escaped_quotes_are_unescaped(self, tmp_path):
+        """Test that escaped quotes inside quoted values are unescaped"""
+        parsed = self._parse(tmp_path, (
+            'DOUBLE="say \\"hi\\" \\\\ bye"\n'
+            "SINGLE='it\\'s'\n"
+        ))
+        
+        assert parsed["DOUBLE"] == 'say "hi" \\ bye'
+        assert parsed["SINGLE"] == "it's"
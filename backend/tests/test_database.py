@@ -54,6 +54,37 @@ class TestDatabaseManager:
         finally:
             db.close()
     
+    def test_bulk_insert_documents(self, test_db_manager, sample_text):
+        """Test bulk inserting documents with binary COPY"""
+        import uuid
+        
+        docs = [
+            DocumentData(
+                id=str(uuid.uuid4()),
+                filename=f"bulk_{i}.txt",
+                full_text=f"{sample_text} — naïve ünïcode {i}",
+                file_hash=uuid.uuid4().hex,
+                chunk_count=i
+            )
+            for i in range(3)
+        ]
+        
+        assert test_db_manager.bulk_insert_documents(docs) == 3
+        assert test_db_manager.bulk_insert_documents([]) == 0
+        
+        db = test_db_manager.get_session()
+        try:
+            for doc in docs:
+                stored_doc = db.query(Document).filter(Document.id == doc.id).first()
+                assert stored_doc is not None
+                assert stored_doc.filename == doc.filename
+                assert stored_doc.full_text == doc.full_text
+                assert stored_doc.full_text_length == len(doc.full_text)
+                assert stored_doc.chunk_count == doc.chunk_count
+                assert stored_doc.created_at is not None
+        finally:
+            db.close()
+    
     def test_store_chunks(self, test_db_manager, sample_text):
         """Test storing chunks using ORM directly"""
         import hashlib
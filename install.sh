@@ -38,6 +38,10 @@ pip install --upgrade pip
 pip install -r requirements.txt
 echo "✅ Backend dependencies installed"
 
+# Precompile backend modules so the first start doesn't pay for bytecode compilation
+python -m compileall -q -x '(^|/)(venv|tests)/' . > /dev/null
+echo "✅ Backend bytecode precompiled"
+
 # Create .env file if it doesn't exist
 if [ ! -f ".env" ]; then
     cp env.example .env